@@ -1,6 +1,11 @@
+import threading
 import gradio as gr
 from dotenv import load_dotenv
-from src.RAG_pipeline import answer_question
+from src.RAG_pipeline import stream_answer_question, db_path
+from src.registry import warm_up
+from src.utils import get_logger
+
+logger = get_logger(__name__)
 
 
 def format_context(context):
@@ -14,12 +19,25 @@ def format_context(context):
 def chat(history):
     last_message = history[-1]["content"]
     prior = history[:-1]
-    answer, context = answer_question(last_message, prior)
-    history.append({"role": "assistant", "content": answer})
-    return history, format_context(context)
+    metrics = {}
+    history.append({"role": "assistant", "content": ""})
+    context, context_markdown = None, ""
+    for answer, chunks in stream_answer_question(last_message, prior, metrics=metrics):
+        if chunks is not context:
+            context, context_markdown = chunks, format_context(chunks)
+        history[-1]["content"] = answer
+        yield history, context_markdown
+    logger.info(
+        f"time_to_first_token={metrics.get('time_to_first_token', 0):.2f}s "
+        f"total={metrics.get('total', 0):.2f}s "
+        f"prompt_tokens={metrics.get('prompt_tokens', 0)}"
+    )
 
 
 def main():
+    # Load the embedding model while the UI starts instead of on the first question.
+    threading.Thread(target=warm_up, args=(db_path,), daemon=True).start()
+
     def put_message_in_chatbot(message, history):
         return "", history + [{"role": "user", "content": message}]
 
@@ -1,10 +1,17 @@
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.retriever import get_retriever
+from src.registry import get_ollama_client, get_ollama_llm, ollama_settings
 from src.rag_system import rewrite_query,fetch_unranked_chunks,merge_chunks,rerank
+from src.query_router import route_query
+from src.context_packer import pack_prompt
+from src.answer_cache import SemanticAnswerCache
+from src.utils.config import load_section, resolve_path
+from src.utils.timing import stage_timer, summarize_timings
 from tenacity import retry, wait_exponential
-from openai import OpenAI
-from langchain_community.llms import Ollama
 
 
 def find_project_root(start: Path, markers=("pyproject.toml", ".git")) -> Path:
@@ -15,14 +22,50 @@ def find_project_root(start: Path, markers=("pyproject.toml", ".git")) -> Path:
     return cur
 
 PROJECT_ROOT =find_project_root(Path(__file__))
-ollama_host = "http://localhost:11434"  # Adjust if your Ollama server is running on a different URL or port
-ollama_base_url = f"{ollama_host}/v1"
-ollama_model="llama3.2"
-ollama_client = OpenAI(base_url=ollama_base_url, api_key="ollama")
-llm = Ollama(model="llama3.2", base_url=ollama_host, temperature=0)
+ollama_model=ollama_settings()["model"]  # Ollama host/URL are read from the `ollama` config section
 db_path=Path(str(PROJECT_ROOT)) / "vectors"
-retriever=get_retriever(db_path=db_path)
 wait = wait_exponential(multiplier=1, min=10, max=240)
+# Pool for the original-question retrieval of fetch_context_parallel, sized by
+# `retrieval.parallel_workers` (one slot per concurrent request is enough)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Shared retrieval pool, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = load_section("retrieval", {"parallel_workers": 4}).get("parallel_workers", 4)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag")
+        return _executor
+
+
+def configure_executor(max_workers):
+    """Replace the retrieval pool with one of `max_workers` threads (e.g. one per benchmark user)"""
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag")
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def default_retriever():
+    """Retriever over db_path; the embedding model is loaded on first call, not at import."""
+    return get_retriever(db_path=db_path)
+
+
+def __getattr__(name):
+    # Backwards-compatible lazy module attributes (see src.registry).
+    if name == "retriever":
+        return default_retriever()
+    if name == "ollama_client":
+        return get_ollama_client()
+    if name == "llm":
+        return get_ollama_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 SYSTEM_PROMPT_TEMPLATE = """
 You are a helpful, knowledgeable assistant with access to a user's personal knowledge base.
 Your role is to answer questions about the user's background, experience, achievements, and projects based on provided context.
@@ -41,11 +84,16 @@ Context:
 
 def _history_to_messages(history):
     msgs = []
-    for pair in history or []:
+    for item in history or []:
+        # Gradio "messages" format: {"role": ..., "content": ...}
+        if isinstance(item, dict):
+            if item.get("role") in ("user", "assistant") and item.get("content"):
+                msgs.append({"role": item["role"], "content": str(item["content"])})
+            continue
         # pair can be tuple/list like (user, assistant) or [user, assistant]
-        if not pair or len(pair) != 2:
+        if not item or len(item) != 2:
             continue
-        user_msg, assistant_msg = pair
+        user_msg, assistant_msg = item
 
         if user_msg:
             msgs.append({"role": "user", "content": str(user_msg)})
@@ -54,36 +102,217 @@ def _history_to_messages(history):
 
     return msgs
 
-def make_rag_messages(question, history, chunks):
-    context = "\n\n".join(
-        f"Extract from {chunk.metadata.get('source','unknown')}:\n{chunk.page_content}"
-        for chunk in chunks
-    )
-    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(context=context)
+def make_rag_messages(question, history, chunks, report=None):
+    """
+    System prompt with the retrieved context, then history and the question,
+    packed into the `context_budget` token budget (see src.context_packer).
+    ``report`` receives the token counts per section.
+    """
+    return pack_prompt(SYSTEM_PROMPT_TEMPLATE, question, _history_to_messages(history), chunks, report=report)
 
-    return (
-        [{"role": "system", "content": system_prompt}]
-        + _history_to_messages(history)
-        + [{"role": "user", "content": question}]
-    )
+def resolve_filter(question, filter=None):
+    """An explicit metadata filter, else the router's guess when `retrieval.route_queries` is on."""
+    if filter is None and load_section("retrieval", {"route_queries": False}).get("route_queries"):
+        return route_query(question)
+    return filter
 
-def fetch_context(original_question,retriever=retriever,top_k=8):
-    rewritten_question = rewrite_query(original_question)
-    chunks1 = fetch_unranked_chunks(original_question, retriever=retriever)
-    chunks2 = fetch_unranked_chunks(rewritten_question, retriever=retriever)
-    chunks = merge_chunks(chunks1, chunks2)
-    reranked = rerank(original_question, chunks)
+
+def fetch_context(original_question,retriever=None,top_k=8,timings=None,filter=None,merge_stats=None):
+    retriever = retriever or default_retriever()
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    filter = resolve_filter(original_question, filter)
+    with stage_timer(timings, "rewrite"):
+        rewritten_question = rewrite_query(original_question)
+    with stage_timer(timings, "retrieve_original"):
+        chunks1 = fetch_unranked_chunks(original_question, retriever=retriever, filter=filter)
+    with stage_timer(timings, "retrieve_rewritten"):
+        chunks2 = fetch_unranked_chunks(rewritten_question, retriever=retriever, filter=filter)
+    with stage_timer(timings, "merge"):
+        chunks = merge_chunks(chunks1, chunks2, stats=merge_stats)
+    with stage_timer(timings, "rerank"):
+        reranked = rerank(original_question, chunks)
+    timings["fetch_context"] = time.perf_counter() - start
     return reranked[:top_k]
 
 
+def _timed(timings, stage, fn, *args, **kwargs):
+    with stage_timer(timings, stage):
+        return fn(*args, **kwargs)
 
-@retry(wait=wait)
-def answer_question(question: str, history,retriever=retriever) -> tuple[str, list]:
+
+def fetch_context_parallel(original_question,retriever=None,top_k=8,timings=None,filter=None,merge_stats=None):
     """
-    Answer a question using RAG and return the answer and the retrieved context
+    Same result as fetch_context, but the original-question retrieval runs
+    on the shared pool while this thread waits on Ollama for the query rewrite.
+    ``merge_stats`` receives the duplicate/overlap counts from merge_chunks.
     """
-    chunks = fetch_context(question, retriever)
+    retriever = retriever or default_retriever()
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    filter = resolve_filter(original_question, filter)
+    original_future = get_executor().submit(
+        _timed, timings, "retrieve_original", fetch_unranked_chunks, original_question, retriever, filter
+    )
+    with stage_timer(timings, "rewrite"):
+        rewritten_question = rewrite_query(original_question)
+    with stage_timer(timings, "retrieve_rewritten"):
+        chunks2 = fetch_unranked_chunks(rewritten_question, retriever=retriever, filter=filter)
+    chunks1 = original_future.result()
+    with stage_timer(timings, "merge"):
+        chunks = merge_chunks(chunks1, chunks2, stats=merge_stats)
+    with stage_timer(timings, "rerank"):
+        reranked = rerank(original_question, chunks)
+    timings["fetch_context"] = time.perf_counter() - start
+    return reranked[:top_k]
+
+
+def _generate(question, history, chunks, timings):
     messages = make_rag_messages(question, history, chunks)
-    response = ollama_client.chat.completions.create(model=ollama_model, messages=messages)
-    return response.choices[0].message.content, chunks
-   
\ No newline at end of file
+    with stage_timer(timings, "generate"):
+        response = get_ollama_client().chat.completions.create(model=ollama_model, messages=messages)
+    return response.choices[0].message.content
+
+
+@retry(wait=wait)
+def answer_question(question: str, history,retriever=None,timings=None) -> tuple[str, list]:
+    """
+    Answer a question using RAG and return the answer and the retrieved context.
+    Pass a dict as ``timings`` to collect per-stage durations in seconds.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    chunks = fetch_context(question, retriever, timings=timings)
+    answer = _generate(question, history, chunks, timings)
+    timings["total"] = time.perf_counter() - start
+    return answer, chunks
+
+
+@retry(wait=wait)
+def answer_question_parallel(question: str, history,retriever=None,timings=None) -> tuple[str, list]:
+    """
+    answer_question built on fetch_context_parallel.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    chunks = fetch_context_parallel(question, retriever, timings=timings)
+    answer = _generate(question, history, chunks, timings)
+    timings["total"] = time.perf_counter() - start
+    return answer, chunks
+
+
+_answer_cache = None
+
+
+def get_answer_cache(retriever=None):
+    """Build the semantic answer cache from the `answer_cache` config section (once)."""
+    global _answer_cache
+    if _answer_cache is None:
+        retriever = retriever or default_retriever()
+        settings = load_section("answer_cache", {
+            "path": "./cache/answer_cache.json",
+            "similarity_threshold": 0.95,
+            "max_entries": 256,
+            "ttl_seconds": 86400,
+        })
+        _answer_cache = SemanticAnswerCache(
+            resolve_path(settings["path"]),
+            embed_fn=retriever.vectorstore.embeddings.embed_query,
+            db_path=db_path,
+            similarity_threshold=settings["similarity_threshold"],
+            max_entries=settings["max_entries"],
+            ttl_seconds=settings["ttl_seconds"],
+        )
+    return _answer_cache
+
+
+def _cacheable(history):
+    return not history and load_section("answer_cache", {"enabled": True})["enabled"]
+
+
+def answer_question_cached(question: str, history, retriever=None, cache=None) -> tuple[str, list]:
+    """
+    answer_question behind the semantic answer cache.
+    Only first-turn questions are cached, since follow-ups depend on the history.
+    """
+    if not _cacheable(history):
+        return answer_question_parallel(question, history, retriever)
+
+    cache = cache or get_answer_cache(retriever)
+    embedding = cache.embed(question)
+    hit = cache.lookup(question, embedding)
+    if hit is not None:
+        return hit
+    answer, chunks = answer_question_parallel(question, history, retriever)
+    cache.store(question, answer, chunks, embedding)
+    return answer, chunks
+
+
+def stream_answer_question(question: str, history, retriever=None, metrics=None, cache=None, use_cache=True):
+    """
+    Streaming answer_question. Yields (answer_so_far, chunks): first with an
+    empty answer as soon as the context is ready, then once per generated token.
+    ``metrics`` collects per-stage timings plus ``time_to_first_token`` and
+    the packed ``prompt_tokens``.
+    First-turn questions go through the semantic answer cache unless
+    ``use_cache`` is False.
+    """
+    metrics = {} if metrics is None else metrics
+    start = time.perf_counter()
+
+    embedding = None
+    if use_cache and _cacheable(history):
+        cache = cache or get_answer_cache(retriever)
+        embedding = cache.embed(question)
+        hit = cache.lookup(question, embedding)
+        if hit is not None:
+            metrics["time_to_first_token"] = metrics["total"] = time.perf_counter() - start
+            yield hit
+            return
+    else:
+        cache = None
+
+    chunks = fetch_context_parallel(question, retriever, timings=metrics)
+    yield "", chunks
+
+    prompt_report = {}
+    with stage_timer(metrics, "pack_prompt"):
+        messages = make_rag_messages(question, history, chunks, report=prompt_report)
+    metrics["prompt_tokens"] = prompt_report["total"]
+    generate_start = time.perf_counter()
+    stream = get_ollama_client().chat.completions.create(model=ollama_model, messages=messages, stream=True)
+    answer = ""
+    for event in stream:
+        delta = event.choices[0].delta.content if event.choices else None
+        if not delta:
+            continue
+        if "time_to_first_token" not in metrics:
+            metrics["time_to_first_token"] = time.perf_counter() - start
+        answer += delta
+        yield answer, chunks
+    metrics["generate"] = time.perf_counter() - generate_start
+    metrics["total"] = time.perf_counter() - start
+
+    if cache is not None and answer:
+        cache.store(question, answer, chunks, embedding)
+
+
+def compare_fetch_latency(questions, retriever=None, top_k=8, percentiles=(50, 95)):
+    """
+    Run every question through fetch_context and fetch_context_parallel and
+    return per-stage latency percentiles for both, plus the p50/p95 saved.
+    """
+    samples = {"sequential": [], "parallel": []}
+    for question in questions:
+        for name, fn in (("sequential", fetch_context), ("parallel", fetch_context_parallel)):
+            timings = {}
+            fn(question, retriever, top_k=top_k, timings=timings)
+            samples[name].append(timings)
+
+    report = {name: summarize_timings(runs, percentiles) for name, runs in samples.items()}
+    report["saved"] = {
+        key: report["sequential"]["fetch_context"][key] - report["parallel"]["fetch_context"][key]
+        for key in report["sequential"].get("fetch_context", {})
+        if key.startswith("p")
+    }
+    return report
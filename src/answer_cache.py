@@ -0,0 +1,159 @@
+"""
+Semantic answer cache - reuse answers for questions that were already asked
+
+Questions are matched by cosine similarity of their e5 query embeddings.
+Entries expire after a TTL, the least recently used entries are evicted
+once the cache is full, and everything is dropped when the Chroma index
+under vectors/ is rebuilt (see src.embedder.bump_index_version).
+
+Embeddings are held in memory as one float32 matrix; lookups only touch
+memory (LRU order included) and the JSON file is rewritten on store().
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.embedder import read_index_version
+
+
+class SemanticAnswerCache:
+    """Persistent question -> (answer, chunks) cache with embedding lookup"""
+
+    def __init__(self, path, embed_fn: Callable[[str], List[float]], db_path,
+                 similarity_threshold: float = 0.95, max_entries: int = 256,
+                 ttl_seconds: float = 86400):
+        """
+        Initialize the cache
+
+        Args:
+            path: JSON file the cache is persisted to
+            embed_fn: Query embedding function (e.g. HuggingFaceEmbeddings.embed_query)
+            db_path: Chroma directory whose index version invalidates the cache
+            similarity_threshold: Minimum cosine similarity for a hit
+            max_entries: LRU capacity
+            ttl_seconds: Entry lifetime (0 or None disables expiry)
+        """
+        self.path = Path(path)
+        self.embed_fn = embed_fn
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.index_version = None
+        self.entries = []
+        self._matrix = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            self.index_version = read_index_version(self.db_path)
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.index_version = data.get("index_version")
+        entries = data.get("entries", [])
+        if entries:
+            self._matrix = np.asarray([e.pop("embedding") for e in entries], dtype=np.float32)
+        self.entries = entries
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        entries = [dict(e, embedding=self._matrix[i].tolist()) for i, e in enumerate(self.entries)]
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"index_version": self.index_version, "entries": entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def _keep(self, positions):
+        """Keep only the entries (and matrix rows) at `positions`"""
+        self.entries = [self.entries[i] for i in positions]
+        self._matrix = self._matrix[positions] if self.entries else None
+
+    def _check_index_version(self):
+        """Drop every entry if the vector index was rebuilt since they were stored"""
+        current = read_index_version(self.db_path)
+        if current != self.index_version:
+            self.entries = []
+            self._matrix = None
+            self.index_version = current
+            self._save()
+
+    def _expire(self, now):
+        if not self.ttl_seconds or not self.entries:
+            return
+        live = [i for i, e in enumerate(self.entries) if now - e["created_at"] <= self.ttl_seconds]
+        if len(live) < len(self.entries):
+            self._keep(live)
+
+    def embed(self, question: str) -> np.ndarray:
+        """Embed and L2-normalize a question"""
+        vector = np.asarray(self.embed_fn(question), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-10)
+
+    def lookup(self, question: str, embedding: np.ndarray = None) -> Optional[Tuple[str, list]]:
+        """
+        Find a stored answer for a semantically equivalent question
+
+        Returns:
+            (answer, chunks) on a hit, None on a miss
+        """
+        if embedding is None:
+            embedding = self.embed(question)
+        with self._lock:
+            self._check_index_version()
+            now = time.time()
+            self._expire(now)
+            if not self.entries:
+                return None
+
+            scores = self._matrix @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+
+            # LRU order is only updated in memory; it is persisted with the next store()
+            entry = self.entries[best]
+            entry["last_used"] = now
+        chunks = [Document(page_content=c["page_content"], metadata=c["metadata"]) for c in entry["chunks"]]
+        return entry["answer"], chunks
+
+    def store(self, question: str, answer: str, chunks: list, embedding: np.ndarray = None):
+        """Add an answer, evicting the least recently used entries when full"""
+        if embedding is None:
+            embedding = self.embed(question)
+        now = time.time()
+        entry = {
+            "question": question,
+            "answer": answer,
+            "chunks": [{"page_content": c.page_content, "metadata": dict(c.metadata)} for c in chunks],
+            "created_at": now,
+            "last_used": now,
+        }
+        with self._lock:
+            self._check_index_version()
+            self._expire(now)
+            row = np.asarray(embedding, dtype=np.float32)[None, :]
+            self.entries.append(entry)
+            self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+            if len(self.entries) > self.max_entries:
+                order = sorted(range(len(self.entries)), key=lambda i: self.entries[i]["last_used"])
+                self._keep(order[-self.max_entries:])
+            self._save()
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self.entries = []
+            self._matrix = None
+            self._save()
+
+    def __len__(self):
+        return len(self.entries)
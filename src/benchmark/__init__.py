@@ -0,0 +1,12 @@
+"""
+Benchmark Module - End-to-end latency measurement of the RAG query path
+"""
+
+from .mock_server import MockLLMServer
+from .harness import run_benchmark, run_question
+
+__all__ = [
+    "MockLLMServer",
+    "run_benchmark",
+    "run_question",
+]
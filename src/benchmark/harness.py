@@ -0,0 +1,203 @@
+"""
+RAG Benchmark - End-to-end latency of the query path against a mock LLM
+
+Replays a question set through stream_answer_question, the path the Gradio
+app uses (query routing, fetch_context_parallel, reranking, prompt packing
+and streamed generation); the answer cache is bypassed unless --answer-cache
+is given. Retrieval and reranking use the real vector store and models;
+Ollama is replaced by MockLLMServer unless --no-mock is given. Prints (or writes) a JSON report
+with per-stage percentiles, throughput per concurrency level and memory,
+tagged with the git commit so runs can be compared.
+
+Usage:
+    python -m src.benchmark.harness --users 1 4 8 --latency 0.2 --tokens-per-second 40
+    python -m src.benchmark.harness --questions questions.txt --output bench.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from src.registry import override_ollama_settings
+from src.utils.config import PROJECT_ROOT, load_section
+from src.utils.timing import summarize_timings
+
+from .mock_server import MockLLMServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Entries of stream_answer_question's metrics that are counts, not seconds
+COUNT_METRICS = ("prompt_tokens",)
+
+DEFAULT_QUESTIONS = [
+    "What is the educational background?",
+    "Which internships were completed and what was the work?",
+    "What programming languages and frameworks are listed as skills?",
+    "Summarize the published research papers.",
+    "What projects use retrieval augmented generation?",
+    "What was the GPA in the master's transcript?",
+    "Which research integrity courses were completed?",
+    "What extracurricular achievements are there?",
+]
+
+
+def run_question(question: str, retriever, timings: Dict, use_cache: bool = False) -> str:
+    """One pass of the app's query path (stream_answer_question), recording each stage in `timings`"""
+    from src.RAG_pipeline import stream_answer_question
+
+    answer = ""
+    for answer, _ in stream_answer_question(question, [], retriever, metrics=timings, use_cache=use_cache):
+        pass
+    return answer
+
+
+def memory_mb() -> Dict:
+    """Current and peak resident set size of this process in MB (None where unavailable)"""
+    current = peak = None
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        current = info.rss / (1024 * 1024)
+        if hasattr(info, "peak_wset"):  # Windows
+            peak = info.peak_wset / (1024 * 1024)
+    except ImportError:
+        pass
+    if peak is None and resource is not None:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux and bytes on macOS
+        peak = peak_kb / (1024 * 1024) if sys.platform == "darwin" else peak_kb / 1024
+    return {"rss_mb": current, "peak_rss_mb": peak}
+
+
+def run_load(questions: List[str], retriever, users: int, repeats: int = 1, use_cache: bool = False) -> Dict:
+    """
+    Replay `questions` `repeats` times with `users` concurrent workers.
+
+    Returns {"samples": [timings, ...], "counts": [{"prompt_tokens": ...}, ...],
+    "errors": [repr, ...], "seconds": wall time}.
+    """
+    samples, counts, errors = [], [], []
+
+    def one(question):
+        timings = {}
+        try:
+            run_question(question, retriever, timings, use_cache)
+            counts.append({key: timings.pop(key) for key in COUNT_METRICS if key in timings})
+            samples.append(timings)
+        except Exception as e:
+            errors.append(repr(e))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix="bench-user") as pool:
+        list(pool.map(one, questions * repeats))
+    return {"samples": samples, "counts": counts, "errors": errors, "seconds": time.perf_counter() - start}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(questions: List[str] = None, users: List[int] = (1,), repeats: int = 1,
+                  retriever=None, percentiles=(50, 95, 99), warmup: bool = True,
+                  use_cache: bool = False) -> Dict:
+    """
+    Benchmark the query path for each concurrency level in `users`
+
+    Returns:
+        {"commit": ..., "questions": n, "memory": {...},
+         "runs": [{"users": n, "requests": n, "errors": n, "seconds": ...,
+                   "requests_per_second": ..., "stages": {stage: {"p50": ..., ...}},
+                   "counts": {"prompt_tokens": {"p50": ..., ...}}}, ...]}
+        Stage values are seconds; counts are kept apart from them.
+    """
+    from src.RAG_pipeline import configure_executor, default_retriever
+
+    questions = list(questions or DEFAULT_QUESTIONS)
+    retriever = retriever or default_retriever()
+    # One retrieval slot per user, so the runs measure the pipeline rather than the pool
+    configure_executor(max(max(users), load_section("retrieval", {"parallel_workers": 4}).get("parallel_workers", 4)))
+    memory_before = memory_mb()
+    if warmup:
+        # Load models and open the store outside the measured runs
+        run_question(questions[0], retriever, {})
+
+    report = {"commit": git_commit(), "questions": len(questions), "repeats": repeats,
+              "answer_cache": use_cache, "runs": []}
+    for n in users:
+        result = run_load(questions, retriever, n, repeats, use_cache)
+        report["runs"].append({
+            "users": n,
+            "requests": len(result["samples"]),
+            "errors": len(result["errors"]),
+            "error_examples": result["errors"][:3],
+            "seconds": result["seconds"],
+            "requests_per_second": len(result["samples"]) / result["seconds"] if result["seconds"] else 0.0,
+            "stages": summarize_timings(result["samples"], percentiles),
+            "counts": summarize_timings(result["counts"], percentiles),
+        })
+    report["memory"] = {"before": memory_before, "after": memory_mb()}
+    return report
+
+
+def load_questions(path: str) -> List[str]:
+    """One question per line (blank lines and # comments skipped)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def main():
+    """Command-line interface for the RAG benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the RAG query path end to end")
+    parser.add_argument("--questions", help="File with one question per line (default: built-in set)")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4], help="Concurrency levels to run")
+    parser.add_argument("--repeats", type=int, default=1, help="Times each question is replayed per level")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock LLM time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0, help="Mock LLM generation speed")
+    parser.add_argument("--response-tokens", type=int, default=64, help="Tokens per mock answer")
+    parser.add_argument("--answer-cache", action="store_true",
+                        help="Go through the semantic answer cache (repeats then measure cache hits)")
+    parser.add_argument("--no-mock", action="store_true", help="Use the Ollama server from config.json")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    questions = load_questions(args.questions) if args.questions else DEFAULT_QUESTIONS
+    server = None
+    if not args.no_mock:
+        server = MockLLMServer(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                               response_tokens=args.response_tokens).start()
+        override_ollama_settings(host=server.url, openai_compatible_url=f"{server.url}/v1")
+    try:
+        report = run_benchmark(questions, args.users, args.repeats, use_cache=args.answer_cache)
+    finally:
+        if server is not None:
+            server.stop()
+            override_ollama_settings()
+
+    report["llm"] = "ollama" if args.no_mock else {
+        "mock": True,
+        "latency": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "response_tokens": args.response_tokens,
+        "requests": server.requests,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Mock LLM Server - Local stand-in for Ollama with simulated latency
+
+Serves the two APIs the RAG pipeline calls:
+
+- POST /v1/chat/completions (OpenAI-compatible; plain, streamed and
+  structured `response_format` requests) used for answers and LLM reranking
+- POST /api/generate (Ollama native, streamed JSON lines) used by the
+  LangChain Ollama LLM for query rewriting
+
+Every response waits `latency` seconds before the first token and then
+emits `tokens_per_second`, so generation cost is predictable and the
+measured time is the pipeline's own.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+_FILLER = ("The candidate worked on retrieval augmented generation projects and "
+           "completed coursework in machine learning and robotics. ").split()
+
+
+def filler_tokens(count: int) -> List[str]:
+    """`count` word tokens of plausible answer text"""
+    return [_FILLER[i % len(_FILLER)] + " " for i in range(count)]
+
+
+def structured_reply(schema: Dict, messages: List[Dict]) -> Dict:
+    """
+    Minimal object matching a JSON schema. Integer lists (the reranker's
+    RankOrder) enumerate the "# CHUNK ID" markers in the prompt.
+    """
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    chunk_count = len(re.findall(r"# CHUNK ID:", prompt))
+    reply = {}
+    for name, prop in schema.get("properties", {}).items():
+        kind = prop.get("type")
+        if kind == "array":
+            reply[name] = list(range(1, chunk_count + 1))
+        elif kind in ("integer", "number"):
+            reply[name] = 0
+        elif kind == "boolean":
+            reply[name] = False
+        else:
+            reply[name] = "mock"
+    return reply
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, body: Dict, status: int = 200):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _emit(self, tokens: List[str]):
+        """Yield tokens paced by the configured latency and token rate"""
+        time.sleep(self.server.latency)
+        delay = 1.0 / self.server.tokens_per_second if self.server.tokens_per_second else 0.0
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+            yield token
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("", "/api/tags", "/v1/models"):
+            self._send_json({"models": [], "data": []})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        self.server.count(self.path)
+        request = self._read_json()
+        if self.path.startswith("/v1/chat/completions"):
+            self._chat_completions(request)
+        elif self.path.startswith("/api/generate"):
+            self._generate(request)
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _chat_completions(self, request: Dict):
+        model = request.get("model", "mock")
+        created = int(time.time())
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            content = json.dumps(structured_reply(schema, request.get("messages", [])))
+            tokens = [content]
+        else:
+            tokens = filler_tokens(self.server.response_tokens)
+
+        if not request.get("stream"):
+            content = "".join(self._emit(tokens))
+            self._send_json({
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+            return
+
+        self._start_stream("text/event-stream")
+        for token in self._emit(tokens):
+            event = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {"role": "assistant", "content": token},
+                                  "finish_reason": None}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+        final = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created, "model": model,
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self._write_chunk(f"data: {json.dumps(final)}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self._end_stream()
+
+    def _generate(self, request: Dict):
+        # Query rewriting: answer with the question itself (the text after the last "Human:")
+        prompt = request.get("prompt", "")
+        question = prompt.rsplit("Human:", 1)[-1].strip() or "query"
+        tokens = [word + " " for word in question.split()][:self.server.response_tokens]
+        model = request.get("model", "mock")
+
+        if request.get("stream") is False:
+            text = "".join(self._emit(tokens))
+            self._send_json({"model": model, "response": text, "done": True})
+            return
+
+        self._start_stream("application/x-ndjson")
+        for token in self._emit(tokens):
+            self._write_chunk(json.dumps({"model": model, "response": token, "done": False}) + "\n")
+        self._write_chunk(json.dumps({"model": model, "response": "", "done": True}) + "\n")
+        self._end_stream()
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    Threaded mock server; use as a context manager or call start()/stop().
+
+    Example:
+        with MockLLMServer(latency=0.2, tokens_per_second=40) as server:
+            override_ollama_settings(host=server.url, openai_compatible_url=server.url + "/v1")
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.2,
+                 tokens_per_second: float = 40.0, response_tokens: int = 64):
+        """
+        Initialize mock server
+
+        Args:
+            host: Interface to bind
+            port: Port (0 = any free port)
+            latency: Seconds before the first token of every response
+            tokens_per_second: Simulated generation speed (0 = instant)
+            response_tokens: Tokens in a generated answer
+        """
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path: str):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
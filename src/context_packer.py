@@ -0,0 +1,116 @@
+"""
+Context Packer - Fit retrieved chunks and chat history into a token budget
+
+The prompt sent to Ollama is system prompt + retrieved context + history +
+question. Prefill time grows with its length, so the packer caps it:
+history keeps the most recent turns that fit `max_history_tokens`, and the
+remaining budget is filled greedily with chunks in rerank-score order.
+Token counts come from src.utils.tokens (a local tokenizer, approximate
+for Llama models).
+"""
+
+from typing import Dict, List, Tuple
+
+from src.utils.config import load_section
+from src.utils.tokens import count_tokens
+
+# Chat-format overhead per message (role markers etc.)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def context_budget_settings() -> Dict:
+    """The `context_budget` config section"""
+    return load_section("context_budget", {
+        "max_prompt_tokens": 3000,
+        "max_history_tokens": 800,
+        "encoding": "cl100k_base",
+    })
+
+
+def format_chunk(chunk) -> str:
+    """How a chunk appears in the system prompt"""
+    return f"Extract from {chunk.metadata.get('source', 'unknown')}:\n{chunk.page_content}"
+
+
+def _message_tokens(message: Dict, encoding: str) -> int:
+    return count_tokens(message["content"], encoding) + MESSAGE_OVERHEAD_TOKENS
+
+
+def pack_history(messages: List[Dict], budget: int, encoding: str) -> Tuple[List[Dict], int]:
+    """
+    Most recent messages that fit in `budget` tokens (older ones are dropped).
+    A leading assistant message is dropped too, so history starts on a user turn.
+
+    Returns (kept messages, tokens used).
+    """
+    kept, used = [], 0
+    for message in reversed(messages):
+        tokens = _message_tokens(message, encoding)
+        if used + tokens > budget:
+            break
+        kept.append(message)
+        used += tokens
+    kept.reverse()
+    while kept and kept[0]["role"] == "assistant":
+        used -= _message_tokens(kept.pop(0), encoding)
+    return kept, used
+
+
+def pack_chunks(chunks: List, budget: int, encoding: str) -> Tuple[List, int]:
+    """
+    Greedily take chunks by rerank score (`metadata["rerank_score"]`, else
+    the given order), skipping any that no longer fit in `budget` tokens.
+
+    Returns (selected chunks in score order, tokens used).
+    """
+    if all("rerank_score" in chunk.metadata for chunk in chunks):
+        chunks = sorted(chunks, key=lambda chunk: chunk.metadata["rerank_score"], reverse=True)
+    selected, used = [], 0
+    for chunk in chunks:
+        # +2 for the blank line that separates extracts
+        tokens = count_tokens(format_chunk(chunk), encoding) + 2
+        if used + tokens > budget:
+            continue
+        selected.append(chunk)
+        used += tokens
+    return selected, used
+
+
+def pack_prompt(system_template: str, question: str, history: List[Dict], chunks: List,
+                settings: Dict = None, report: Dict = None) -> List[Dict]:
+    """
+    Build chat messages (system with context, history, question) within the
+    `context_budget` settings.
+
+    If `report` is given it receives token counts per section (system,
+    context, history, question, total) plus the chunks and history
+    messages that were used and dropped.
+    """
+    settings = settings or context_budget_settings()
+    encoding = settings["encoding"]
+    system_tokens = count_tokens(system_template.format(context=""), encoding) + MESSAGE_OVERHEAD_TOKENS
+    question_tokens = count_tokens(question, encoding) + MESSAGE_OVERHEAD_TOKENS
+    remaining = max(0, settings["max_prompt_tokens"] - system_tokens - question_tokens)
+
+    kept_history, history_tokens = pack_history(history, min(settings["max_history_tokens"], remaining), encoding)
+    selected, context_tokens = pack_chunks(chunks, remaining - history_tokens, encoding)
+    context = "\n\n".join(format_chunk(chunk) for chunk in selected)
+
+    if report is not None:
+        report.update({
+            "system": system_tokens,
+            "context": context_tokens,
+            "history": history_tokens,
+            "question": question_tokens,
+            "total": system_tokens + context_tokens + history_tokens + question_tokens,
+            "budget": settings["max_prompt_tokens"],
+            "chunks_used": len(selected),
+            "chunks_dropped": len(chunks) - len(selected),
+            "history_used": len(kept_history),
+            "history_dropped": len(history) - len(kept_history),
+        })
+    return (
+        [{"role": "system", "content": system_template.format(context=context)}]
+        + kept_history
+        + [{"role": "user", "content": question}]
+    )
@@ -1,4 +1,5 @@
 
+import json
 from pathlib import Path
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
@@ -20,4 +21,74 @@ def chunking(documents):
     chunks = text_splitter.split_documents(docs)
     print(f"Divided into {len(chunks)} chunks")
     print(f"First chunk:\n\n{chunks[45]}")
-    return chunks
\ No newline at end of file
+    return chunks
+
+def iter_documents(filenames):
+    """Lazily read files one at a time (same dicts as fetch_documents)."""
+    for filename in filenames:
+        folder=Path(filename).parent.name.lower()
+        with open(filename, "r", encoding="utf-8") as f:
+            yield {"type": folder, "source": filename, "text": f.read()}
+
+
+def iter_chunks(documents, chunk_size=700, chunk_overlap=200):
+    """Split documents one at a time, yielding chunks in source order."""
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    for d in documents:
+        doc = Document(page_content=d["text"], metadata={"type": d["type"], "source": d["source"]})
+        yield from text_splitter.split_documents([doc])
+
+
+def ingest(db_path, filenames, batch_size=None, max_in_flight=2, prune=True):
+    """
+    Streaming ingestion: file reader -> splitter -> batched embedder -> Chroma upsert.
+    Memory stays bounded by one file plus `max_in_flight` batches; the
+    batch size defaults to src.embedder.upsert_batch_size().
+    With prune=False, indexed files not in `filenames` are kept.
+    """
+    from src.embedder import print_index_stats, stream_index
+
+    vectorstore, stats = stream_index(
+        db_path, iter_chunks(iter_documents(filenames)), batch_size=batch_size, max_in_flight=max_in_flight,
+        prune=prune,
+    )
+    print_index_stats(vectorstore, stats)
+    return stats
+
+
+def _manifest_sources(db_path, paths):
+    """Map resolved paths to the source names already used in the index manifest."""
+    from src.embedder import load_manifest
+
+    known = {str(Path(source).resolve()): source for source in load_manifest(db_path)}
+    return [known.get(str(Path(path).resolve()), path) for path in paths]
+
+
+def ingest_changed(db_path, changed_file, batch_size=None, max_in_flight=2):
+    """
+    Re-chunk and re-embed only the files listed in a changed-files list, such
+    as the .changed_summaries.json written by the GitHub docs generator, and
+    delete the chunks of the files listed as removed. Everything else in the
+    index is left as it is. The list is cleared once it has been ingested.
+    """
+    from src.embedder import remove_sources
+
+    with open(changed_file, "r", encoding="utf-8") as f:
+        pending = json.load(f)
+    changed = _manifest_sources(db_path, pending.get("changed", []))
+    removed = _manifest_sources(db_path, pending.get("removed", []))
+    filenames = [name for name in changed if Path(name).exists()]
+    missing = [name for name in changed if not Path(name).exists()]
+
+    stats = None
+    if filenames:
+        stats = ingest(db_path, filenames, batch_size=batch_size, max_in_flight=max_in_flight, prune=False)
+    deleted = remove_sources(db_path, removed + missing)
+    if deleted:
+        print(f"Deleted {deleted} chunks of {len(removed) + len(missing)} removed files")
+    if not filenames and not deleted:
+        print("No changed files to ingest")
+
+    with open(changed_file, "w", encoding="utf-8") as f:
+        json.dump({"changed": [], "removed": []}, f, indent=2)
+    return stats
@@ -1,14 +1,324 @@
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from pathlib import Path
+import atexit
+import itertools
+import json
 import os
-def embedder(db_path, chunks):
+import queue
+import threading
+import time
+import uuid
+from src.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.lexical_index import BM25Index
+from src.utils.config import load_section, resolve_path
+from src.utils.hashing import text_hash
+
+# Written next to the Chroma files every time the collection changes, so
+# caches built on top of the index (e.g. the answer cache) can detect rebuilds.
+INDEX_VERSION_FILE = "index_version.txt"
+# source path -> {"hash": content hash, "ids": [chunk ids]} for incremental indexing
+MANIFEST_FILE = "index_manifest.json"
+UPSERT_BATCH_SIZE = 500
+
+
+def bump_index_version(db_path):
+    version = uuid.uuid4().hex
+    Path(db_path).mkdir(parents=True, exist_ok=True)
+    (Path(db_path) / INDEX_VERSION_FILE).write_text(version, encoding="utf-8")
+    return version
+
+
+def read_index_version(db_path):
+    version_file = Path(db_path) / INDEX_VERSION_FILE
+    if not version_file.exists():
+        return None
+    return version_file.read_text(encoding="utf-8").strip()
+
+
+def load_manifest(db_path):
+    manifest_file = Path(db_path) / MANIFEST_FILE
+    if not manifest_file.exists():
+        return {}
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(db_path, manifest):
+    Path(db_path).mkdir(parents=True, exist_ok=True)
+    manifest_file = Path(db_path) / MANIFEST_FILE
+    tmp_file = manifest_file.with_suffix(".json.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def group_by_source(chunks):
+    grouped = {}
+    for chunk in chunks:
+        grouped.setdefault(str(chunk.metadata.get("source", "")), []).append(chunk)
+    return grouped
+
+
+def source_chunk_ids(source, count):
+    """Deterministic ids, so re-indexing a file overwrites its previous chunks."""
+    prefix = text_hash(source)[:16]
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+def content_hash(chunks):
+    return text_hash("\n\x00".join(chunk.page_content for chunk in chunks))
+
+
+class PooledEmbeddings(Embeddings):
+    """
+    Encode documents with a persistent sentence-transformers process pool.
+
+    Each worker receives whole encode batches (chunk_size=batch_size).
+    Calls that fit in a single batch, and queries, stay in-process.
+    """
+
+    def __init__(self, embeddings, processes, batch_size=32, normalize=True):
+        self.embeddings = embeddings
+        self.processes = processes
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            model = self.embeddings._client
+            self._pool = model.start_multi_process_pool(target_devices=["cpu"] * self.processes)
+            atexit.register(model.stop_multi_process_pool, self._pool)
+        return self._pool
+
+    def embed_documents(self, texts):
+        if len(texts) <= self.batch_size:
+            return self.embeddings.embed_documents(texts)
+        vectors = self.embeddings._client.encode(
+            [text.replace("\n", " ") for text in texts],
+            pool=self._get_pool(),
+            batch_size=self.batch_size,
+            chunk_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+def upsert_batch_size():
+    """
+    Chunks per upsert batch: at least UPSERT_BATCH_SIZE, and enough to give
+    every encode process a full batch when the embedding pool is enabled.
+    """
+    encoding = load_section("embedding", {"batch_size": 32, "processes": 1})
+    processes = encoding["processes"] or os.cpu_count()
+    return max(UPSERT_BATCH_SIZE, encoding["batch_size"] * processes)
+
+
+def load_embeddings(model_name="intfloat/e5-large-v2", normalize=True):
+    """
+    HuggingFace embeddings configured from the `embedding` config section
+    (batch_size; processes > 1 starts an encode pool, 0 uses every core),
+    wrapped in the on-disk embedding cache when enabled.
+    """
+    encoding = load_section("embedding", {"batch_size": 32, "processes": 1})
     embeddings = HuggingFaceEmbeddings(
-        model_name="intfloat/e5-large-v2",
-        encode_kwargs={"normalize_embeddings": True},  # recommended for cosine similarity
+        model_name=model_name,
+        # normalize: recommended for cosine similarity
+        encode_kwargs={"normalize_embeddings": normalize, "batch_size": encoding["batch_size"]},
     )
-    if os.path.exists(db_path):
-        Chroma(persist_directory=db_path, embedding_function=embeddings).delete_collection()
-    vectorstore = Chroma.from_documents(documents=chunks, embedding=embeddings, persist_directory=db_path)
-    print(f"Vectorstore created with {vectorstore._collection.count()} documents")
-    return vectorstore
+    processes = encoding["processes"] or os.cpu_count()
+    if processes > 1:
+        embeddings = PooledEmbeddings(embeddings, processes, encoding["batch_size"], normalize)
+    settings = load_section("embedding_cache", {"enabled": True, "path": "./cache/embeddings"})
+    if not settings["enabled"]:
+        return embeddings
+    cache = EmbeddingCache(resolve_path(settings["path"]), model_name, normalize)
+    return CachedEmbeddings(embeddings, cache)
 
+
+def _upsert_worker(vectorstore, batches, errors, throughput):
+    """Consume (docs, ids) batches until a None sentinel; embedding happens in add_documents."""
+    while True:
+        batch = batches.get()
+        if batch is None:
+            return
+        if errors:
+            continue  # drain so the producer never blocks after a failure
+        try:
+            docs, ids = batch
+            started = time.perf_counter()
+            vectorstore.add_documents(docs, ids=ids)
+            throughput["seconds"] += time.perf_counter() - started
+            throughput["chunks"] += len(docs)
+        except Exception as e:
+            errors.append(e)
+
+
+def _length_sorted(docs, ids):
+    order = sorted(range(len(docs)), key=lambda i: len(docs[i].page_content), reverse=True)
+    return [docs[i] for i in order], [ids[i] for i in order]
+
+
+def index_sources(db_path, groups, rebuild=False, batch_size=None, max_in_flight=2, prune=True):
+    """
+    Incrementally index an iterable of (source, chunks) groups.
+
+    Groups are consumed lazily: each changed source is cut into batches that
+    a background thread embeds and upserts while the next sources are read.
+    At most `max_in_flight` batches wait in the queue, so a slow embedder
+    blocks the reader instead of letting memory grow with the corpus.
+    Batches are filled across sources and sorted by chunk length to reduce
+    padding in the encoder. `batch_size` defaults to upsert_batch_size().
+
+    The BM25 lexical index (src.lexical_index) is kept in step with the
+    collection through its SQLite tables, so it does not add to the memory
+    bound; it is backfilled from unchanged sources if it is missing.
+    With prune=False, sources missing from `groups` are left in the index
+    (for partial updates of a few changed files); this requires an existing
+    manifest, otherwise ValueError is raised rather than resetting the index.
+
+    Returns the vectorstore and a dict with the number of chunks
+    added, updated, deleted and unchanged, plus embedding throughput
+    in chunks_per_second.
+    """
+    from src.registry import get_vectorstore
+
+    batch_size = batch_size or upsert_batch_size()
+    manifest = {} if rebuild else load_manifest(db_path)
+    vectorstore = get_vectorstore(db_path)
+    if not manifest and vectorstore._collection.count():
+        if not prune and not rebuild:
+            # A partial update cannot rebuild what it was not given.
+            raise ValueError(
+                f"{db_path} has no index manifest; run a full ingest (or pass rebuild=True) "
+                "before partial updates with prune=False"
+            )
+        # Built without a manifest (or rebuild requested): ids are unknown, start over.
+        vectorstore.reset_collection()
+    lexical = BM25Index.load(db_path)
+    if not manifest:
+        lexical.clear()
+    backfill_lexical = bool(manifest) and not len(lexical)
+
+    stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    delete_ids, seen = [], set()
+    pending_docs, pending_ids = [], []
+    batches = queue.Queue(maxsize=max_in_flight)
+    errors = []
+    throughput = {"chunks": 0, "seconds": 0.0}
+    worker = threading.Thread(target=_upsert_worker, args=(vectorstore, batches, errors, throughput), daemon=True)
+    worker.start()
+    try:
+        for source, docs in groups:
+            docs = list(docs)
+            seen.add(source)
+            digest = content_hash(docs)
+            entry = manifest.get(source)
+            if entry and entry["hash"] == digest:
+                stats["unchanged"] += len(docs)
+                if backfill_lexical:
+                    lexical.add(entry["ids"], [doc.page_content for doc in docs], [doc.metadata for doc in docs])
+                continue
+            ids = source_chunk_ids(source, len(docs))
+            lexical.add(ids, [doc.page_content for doc in docs], [doc.metadata for doc in docs])
+            if entry:
+                stale = sorted(set(entry["ids"]) - set(ids))
+                lexical.remove(stale)
+                delete_ids.extend(stale)
+                stats["deleted"] += len(stale)
+                stats["updated"] += len(docs)
+            else:
+                stats["added"] += len(docs)
+            pending_docs.extend(docs)
+            pending_ids.extend(ids)
+            while len(pending_docs) >= batch_size:
+                batches.put(_length_sorted(pending_docs[:batch_size], pending_ids[:batch_size]))
+                del pending_docs[:batch_size], pending_ids[:batch_size]
+            manifest[source] = {"hash": digest, "ids": ids}
+            if errors:
+                break
+        if pending_docs and not errors:
+            batches.put(_length_sorted(pending_docs, pending_ids))
+    finally:
+        batches.put(None)
+        worker.join()
+    if errors:
+        raise errors[0]
+    stats["chunks_per_second"] = throughput["chunks"] / throughput["seconds"] if throughput["seconds"] else 0.0
+
+    for source in [s for s in manifest if s not in seen and prune]:
+        delete_ids.extend(manifest[source]["ids"])
+        lexical.remove(manifest[source]["ids"])
+        stats["deleted"] += len(manifest[source]["ids"])
+        del manifest[source]
+    if delete_ids:
+        vectorstore.delete(ids=delete_ids)
+
+    save_manifest(db_path, manifest)
+    lexical.save(db_path)
+    if stats["added"] or stats["updated"] or stats["deleted"] or rebuild:
+        bump_index_version(db_path)
+    return vectorstore, stats
+
+
+def remove_sources(db_path, sources):
+    """
+    Delete every chunk of the given sources (manifest keys) from the
+    collection and the lexical index. Returns the number of chunks deleted.
+    """
+    from src.registry import get_vectorstore
+
+    manifest = load_manifest(db_path)
+    delete_ids = []
+    for source in [s for s in sources if s in manifest]:
+        delete_ids.extend(manifest.pop(source)["ids"])
+    if not delete_ids:
+        return 0
+    get_vectorstore(db_path).delete(ids=delete_ids)
+    lexical = BM25Index.load(db_path)
+    lexical.remove(delete_ids)
+    lexical.save(db_path)
+    save_manifest(db_path, manifest)
+    bump_index_version(db_path)
+    return len(delete_ids)
+
+
+def update_index(db_path, chunks, rebuild=False):
+    """
+    Bring the Chroma collection in line with `chunks`, embedding only the
+    chunks of new or changed source files and deleting those of removed files.
+
+    Returns the vectorstore and a dict with the number of chunks
+    added, updated, deleted and unchanged.
+    """
+    return index_sources(db_path, group_by_source(chunks).items(), rebuild=rebuild)
+
+
+def stream_index(db_path, chunks, rebuild=False, batch_size=None, max_in_flight=2, prune=True):
+    """
+    Like update_index, but `chunks` may be any iterator (e.g. a generator
+    from src.data_ingestion.iter_chunks). Chunks of one source must be contiguous.
+    """
+    groups = itertools.groupby(chunks, key=lambda chunk: str(chunk.metadata.get("source", "")))
+    return index_sources(db_path, groups, rebuild=rebuild, batch_size=batch_size, max_in_flight=max_in_flight,
+                         prune=prune)
+
+
+def print_index_stats(vectorstore, stats):
+    print(
+        f"Index updated: {stats['added']} added, {stats['updated']} updated, "
+        f"{stats['deleted']} deleted, {stats['unchanged']} unchanged"
+    )
+    if stats.get("chunks_per_second"):
+        print(f"Embedding throughput: {stats['chunks_per_second']:.1f} chunks/s")
+    print(f"Vectorstore holds {vectorstore._collection.count()} documents")
+
+
+def embedder(db_path, chunks, rebuild=False):
+    vectorstore, stats = update_index(db_path, chunks, rebuild=rebuild)
+    print_index_stats(vectorstore, stats)
+    return vectorstore
@@ -0,0 +1,117 @@
+"""
+Embedding cache - persist embeddings keyed by (model, normalize flag, text hash)
+
+Vectors are stored as float32 blobs in a SQLite database keyed by the
+SHA-256 of each text. Wrapping an embeddings model with CachedEmbeddings
+turns re-embedding a known chunk into a lookup instead of a forward pass.
+SQLite's file locking lets several processes (the app and an ingest run)
+share one cache directory; each write is a single appending transaction.
+Query embeddings are kept in a small in-memory LRU only.
+"""
+
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.utils.hashing import text_hash
+
+# SQLite's default limit on host parameters per statement is 999
+_LOOKUP_CHUNK = 900
+
+
+class EmbeddingCache:
+    """On-disk float32 vector cache for one (model, normalize) pair"""
+
+    DB_FILE = "embeddings.sqlite"
+
+    def __init__(self, cache_dir, model_name: str, normalize: bool = True):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Root cache directory
+            model_name: Embedding model name (part of the cache key)
+            normalize: Whether the model normalizes embeddings (part of the cache key)
+        """
+        slug = re.sub(r"[^a-zA-Z0-9._-]+", "_", model_name)
+        self.dir = Path(cache_dir) / f"{slug}{'-normalized' if normalize else ''}"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.dir / self.DB_FILE, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def get(self, keys: List[str]) -> List:
+        """Cached vector per key, or None for misses"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return [found.get(k) for k in keys]
+
+    def put(self, keys: List[str], vectors: List[List[float]]):
+        """Store vectors for keys"""
+        if not keys:
+            return
+        rows = [(k, np.asarray(v, dtype=np.float32).tobytes()) for k, v in zip(keys, vectors)]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO vectors (key, vector) VALUES (?, ?)", rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper backed by an EmbeddingCache"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, query_cache_size: int = 1024):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.query_cache_size = query_cache_size
+        self._queries = OrderedDict()
+        self._query_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [text_hash(text) for text in texts]
+        cached = self.cache.get(keys)
+
+        missing = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            self.cache.put(list(missing), vectors)
+            fresh = dict(zip(missing, vectors))
+            cached = [fresh[k] if v is None else v for k, v in zip(keys, cached)]
+        return [list(map(float, v)) for v in cached]
+
+    def embed_query(self, text: str) -> List[float]:
+        # User queries are not written to disk: they would grow the cache
+        # without bound and put a write on the live query path.
+        key = text_hash(text)
+        with self._query_lock:
+            vector = self._queries.get(key)
+            if vector is not None:
+                self._queries.move_to_end(key)
+        if vector is None:
+            vector = list(map(float, self.embeddings.embed_query(text)))
+            with self._query_lock:
+                self._queries[key] = vector
+                while len(self._queries) > self.query_cache_size:
+                    self._queries.popitem(last=False)
+        return list(vector)
@@ -11,7 +11,7 @@ Setup:
    - OPENAI_API_KEY: OpenAI API key (required)
 
 2. Run:
-   python github_docs_generator.py
+   python github_docs_generator.py [--workers 4] [--github-concurrency 8] [--llm-concurrency 2]
 
 Output will be saved to: data/raw/repo_summaries/
 """
@@ -19,14 +19,27 @@ Output will be saved to: data/raw/repo_summaries/
 import os
 import re
 import json
+import time
 import base64
+import hashlib
+import tarfile
 import pathlib
+import argparse
+import threading
 import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from openai import OpenAI
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+try:
+    from .http_cache import DEFAULT_TTLS, HTTPCache
+except ImportError:  # run as a script: python src/github_docs/github_docs_generator.py
+    from http_cache import DEFAULT_TTLS, HTTPCache
+
 # Get project root directory (2 levels up from this file: src/github_docs/ -> project root)
 SCRIPT_DIR = pathlib.Path(__file__).parent.resolve()
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
@@ -50,6 +63,23 @@ MAX_TREE_ITEMS = 800
 MAX_FILE_CHARS = 12000
 MAX_SOURCE_FILES = 12
 
+# Concurrency limits (overridable from the command line)
+DEFAULT_WORKERS = 4
+DEFAULT_GITHUB_CONCURRENCY = 8
+DEFAULT_LLM_CONCURRENCY = 2
+MAX_RATE_LIMIT_RETRIES = 5
+# Repos larger than this (GitHub reports size in KB) fetch files one by one instead of via the tarball
+TARBALL_MAX_KB = 50_000
+
+# repo full_name -> pushed_at / tree SHA / summary path / prompt hash of the last generated summary
+STATE_FILE = OUT_DIR / ".summary_state.json"
+# Summaries written or removed since the last incremental ingestion (src.data_ingestion.ingest_changed)
+CHANGED_FILE = OUT_DIR / ".changed_summaries.json"
+# Bump when make_prompt's template changes, so every summary is regenerated once
+PROMPT_VERSION = 1
+# On-disk HTTP cache for GitHub responses (see http_cache.py)
+CACHE_DIR = PROJECT_ROOT / "cache" / "github"
+
 IMPORTANT_FILES = [
     "README.md", "README.MD", "README.rst",
     "pyproject.toml", "requirements.txt", "Pipfile", "setup.py",
@@ -74,9 +104,128 @@ def gh_headers():
     return h
 
 
+class RateLimiter:
+    """
+    Shared GitHub rate-limit state.
+
+    Every response updates it from the X-RateLimit-* / Retry-After headers.
+    When the primary limit is exhausted, or a secondary limit is hit, all
+    threads pause until the reset time; repeated secondary limits back off
+    exponentially.
+    """
+
+    def __init__(self, low_watermark=50):
+        self.low_watermark = low_watermark
+        self.resume_at = 0.0
+        self.backoff = 1.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Sleep until requests are allowed again."""
+        while True:
+            with self.lock:
+                delay = self.resume_at - time.time()
+            if delay <= 0:
+                return
+            time.sleep(min(delay, 60))
+
+    def pause(self, seconds):
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.time() + seconds)
+
+    def update(self, response):
+        """
+        Record rate-limit headers. Returns True if the request was rejected by
+        a rate limit and should be retried after wait().
+        """
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        limited = response.status_code == 429 or (
+            response.status_code == 403 and (remaining == "0" or "rate limit" in response.text.lower())
+        )
+        if headers.get("Retry-After"):
+            self.pause(float(headers["Retry-After"]))
+        elif limited and remaining == "0" and reset:
+            self.pause(float(reset) - time.time() + 1)
+        elif limited:
+            with self.lock:
+                self.backoff = min(self.backoff * 2, 300.0)
+            self.pause(self.backoff)
+        elif remaining is not None and reset and int(remaining) < self.low_watermark:
+            # Nearly out: spread the remaining requests over the time left in the window.
+            self.pause(max(0.0, float(reset) - time.time()) / max(1, int(remaining)))
+        if not limited:
+            with self.lock:
+                self.backoff = max(1.0, self.backoff / 2)
+        return limited
+
+
+rate_limiter = RateLimiter()
+_github_limit = DEFAULT_GITHUB_CONCURRENCY
+_github_slots = threading.BoundedSemaphore(DEFAULT_GITHUB_CONCURRENCY)
+_llm_slots = threading.BoundedSemaphore(DEFAULT_LLM_CONCURRENCY)
+_session = None
+_session_lock = threading.Lock()
+# GitHub API requests made per repository ("owner/name"), for instrumentation
+request_counts = Counter()
+_REPO_URL_RE = re.compile(r"api\.github\.com/repos/([^/]+/[^/?]+)")
+http_cache = None
+
+
+def configure_concurrency(github=DEFAULT_GITHUB_CONCURRENCY, llm=DEFAULT_LLM_CONCURRENCY):
+    """Set the maximum number of simultaneous GitHub requests and LLM calls."""
+    global _github_limit, _github_slots, _llm_slots, _session
+    _github_limit = github
+    _github_slots = threading.BoundedSemaphore(github)
+    _llm_slots = threading.BoundedSemaphore(llm)
+    with _session_lock:
+        _session = None
+
+
+def get_session():
+    """One keep-alive session (connection pool sized for the GitHub limit) shared by all threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update(gh_headers())
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_github_limit)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def count_request(url):
+    """Attribute one GitHub request to the repository in its URL."""
+    match = _REPO_URL_RE.search(url)
+    with _session_lock:
+        request_counts[match.group(1) if match else "(account)"] += 1
+
+
+def configure_cache(cache_dir=CACHE_DIR, offline=False, ttls=None, enabled=True):
+    """Enable the on-disk HTTP cache for gh_get (offline = replay recorded responses only)."""
+    global http_cache
+    http_cache = HTTPCache(cache_dir, ttls=ttls, offline=offline) if enabled or offline else None
+    return http_cache
+
+
+def send_request(url, params=None, headers=None):
+    """One rate-limit aware GET on the shared session (retried while rate limited)."""
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        rate_limiter.wait()
+        with _github_slots:
+            count_request(url)
+            r = get_session().get(url, params=params, headers=headers, timeout=60)
+        if not rate_limiter.update(r):
+            break
+    return r
+
+
 def gh_get(url, params=None):
-    """Make authenticated GET request to GitHub API."""
-    r = requests.get(url, headers=gh_headers(), params=params, timeout=60)
+    """Make authenticated GET request to GitHub API (rate-limit aware, cached when enabled)."""
+    if http_cache is not None:
+        return http_cache.get_json(url, params, send_request)
+    r = send_request(url, params)
     r.raise_for_status()
     return r.json()
 
@@ -103,19 +252,21 @@ def get_default_branch(repo_full_name, fallback="main"):
     return repo.get("default_branch") or fallback
 
 
-def get_repo_tree(repo_full_name, branch):
+def fetch_tree(repo_full_name, branch):
     """
-    Get full recursive tree for a repository branch.
-    Two-step process: get commit SHA from branch ref, then fetch full recursive tree.
+    Get the root tree SHA and full recursive tree for a repository branch.
+    The trees endpoint resolves the branch name itself, so this is a single request.
     """
-    ref = gh_get(f"https://api.github.com/repos/{repo_full_name}/git/refs/heads/{branch}")
-    sha = ref["object"]["sha"]
-    
     tree = gh_get(
-        f"https://api.github.com/repos/{repo_full_name}/git/trees/{sha}",
+        f"https://api.github.com/repos/{repo_full_name}/git/trees/{branch}",
         params={"recursive": 1}
     )
-    return tree.get("tree", [])
+    return tree.get("sha"), tree.get("tree", [])
+
+
+def get_repo_tree(repo_full_name, branch):
+    """Get full recursive tree for a repository branch."""
+    return fetch_tree(repo_full_name, branch)[1]
 
 
 def is_probably_binary(path):
@@ -143,14 +294,66 @@ def fetch_file_text(repo_full_name, path, branch):
         content = data.get("content", "")
         if data.get("encoding") == "base64" and content:
             raw = base64.b64decode(content.encode("utf-8", errors="ignore"))
-            try:
-                txt = raw.decode("utf-8", errors="replace")
-            except Exception:
-                txt = raw.decode("latin-1", errors="replace")
-            return txt[:MAX_FILE_CHARS]
+            return decode_text(raw)
     return ""
 
 
+def decode_text(raw):
+    """Decode file bytes (UTF-8, falling back to Latin-1) and truncate to MAX_FILE_CHARS."""
+    try:
+        txt = raw.decode("utf-8", errors="replace")
+    except Exception:
+        txt = raw.decode("latin-1", errors="replace")
+    return txt[:MAX_FILE_CHARS]
+
+
+def fetch_files_from_tarball(repo_full_name, paths, branch):
+    """
+    Fetch several files with one request: stream the branch tarball and keep
+    only the wanted members in memory. The download stops as soon as every
+    wanted file has been read.
+
+    Returns {path: text} for the paths that are regular files.
+    """
+    url = f"https://api.github.com/repos/{repo_full_name}/tarball/{branch}"
+    if http_cache is not None:
+        return http_cache.remember(url, {"paths": sorted(paths)}, lambda etag: _read_tarball(url, paths, etag))
+    return _read_tarball(url, paths)[0]
+
+
+def _read_tarball(url, paths, etag=None):
+    """
+    (files, ETag) read from the tarball stream, or None when `etag` is given
+    and the archive is unchanged (304, nothing is downloaded).
+    """
+    wanted, found = set(paths), {}
+    headers = {"If-None-Match": etag} if etag else None
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        rate_limiter.wait()
+        with _github_slots:
+            count_request(url)
+            # The API redirects to codeload, which answers If-None-Match with a 304
+            with get_session().get(url, headers=headers, stream=True, timeout=120) as r:
+                if rate_limiter.update(r):
+                    continue
+                if r.status_code == 304:
+                    return None
+                r.raise_for_status()
+                r.raw.decode_content = True
+                with tarfile.open(fileobj=r.raw, mode="r|gz") as tar:
+                    for member in tar:
+                        # Members are prefixed with "<owner>-<repo>-<sha>/"
+                        path = member.name.split("/", 1)[-1]
+                        if not member.isfile() or path not in wanted:
+                            continue
+                        # Up to 4 bytes per character, enough for MAX_FILE_CHARS after decoding
+                        found[path] = decode_text(tar.extractfile(member).read(MAX_FILE_CHARS * 4))
+                        if len(found) == len(wanted):
+                            break
+                return found, r.headers.get("ETag")
+    raise RuntimeError(f"GitHub rate limit: gave up fetching {url}")
+
+
 def pick_key_files(tree_paths):
     """
     Multi-stage file selection:
@@ -160,7 +363,7 @@ def pick_key_files(tree_paths):
     """
     picked = []
     
-    for imp in tqdm(IMPORTANT_FILES, desc="Finding important files"):
+    for imp in IMPORTANT_FILES:
         for p in tree_paths:
             if p == imp or p.endswith("/" + imp) or (imp.endswith("/") and p.startswith(imp)):
                 picked.append(p)
@@ -170,17 +373,47 @@ def pick_key_files(tree_paths):
     picked.extend(src[:MAX_SOURCE_FILES])
 
     seen, out = set(), []
-    for p in tqdm(picked, desc="Deduplicating files"):
+    for p in picked:
         if p not in seen:
             seen.add(p)
             out.append(p)
     return out
 
 
-def build_repo_context(repo, tree):
+def fetch_files(repo, paths, branch):
+    """
+    Text of the chosen files, in the order given. Uses one tarball request,
+    except for very large repositories (or if the tarball stream is
+    unreadable), where files are fetched one by one in parallel.
+
+    Rate-limit and HTTP errors are not retried another way: they propagate
+    so the repository fails and its state is left for the next run.
+    """
+    if not paths:
+        return {}
+    repo_full = repo["full_name"]
+    texts = None
+    if (repo.get("size") or 0) <= TARBALL_MAX_KB:
+        try:
+            texts = fetch_files_from_tarball(repo_full, paths, branch)
+        except tarfile.TarError:
+            texts = None
+    if texts is None:
+        # Requests are bounded by the GitHub semaphore, so fetch all files at once.
+        with ThreadPoolExecutor(max_workers=min(len(paths), 8)) as pool:
+            texts = dict(zip(paths, pool.map(lambda p: fetch_file_text(repo_full, p, branch), paths)))
+    return {p: texts[p] for p in paths if p in texts}
+
+
+def repo_branch(repo):
+    """Default branch from the list_repos payload (one extra request only if it is missing)."""
+    return repo.get("default_branch") or get_default_branch(repo["full_name"])
+
+
+def build_repo_context(repo, tree, branch=None):
     """Build complete context for repository documentation generation."""
     repo_full = repo["full_name"]
-    branch = get_default_branch(repo_full)
+    branch = branch or repo_branch(repo)
 
     tree_items = [t for t in tree if t.get("type") in ("blob", "tree")]
     tree_items = tree_items[:MAX_TREE_ITEMS]
@@ -190,14 +423,12 @@ def build_repo_context(repo, tree):
 
     chosen = pick_key_files(files)
 
+    # Only blobs have contents; directories picked by name would keep the tarball stream reading to the end.
+    blob_paths = {t["path"] for t in tree_items if t.get("type") == "blob"}
     file_blobs = []
-    for p in chosen:
-        try:
-            txt = fetch_file_text(repo_full, p, branch)
-            if txt.strip():
-                file_blobs.append({"path": p, "text": txt})
-        except Exception:
-            continue
+    for p, txt in fetch_files(repo, [p for p in chosen if p in blob_paths], branch).items():
+        if txt.strip():
+            file_blobs.append({"path": p, "text": txt})
 
     meta = {
         "name": repo.get("name"),
@@ -265,48 +496,174 @@ def safe_filename(name: str) -> str:
     return name or "repo"
 
 
+_openai_client = None
+
+
+def get_openai_client():
+    """OpenAI client shared by all worker threads (it pools its own connections)."""
+    global _openai_client
+    with _session_lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        return _openai_client
+
+
 def generate_markdown_with_openai(prompt: str) -> str:
     """Generate markdown documentation using OpenAI SDK."""
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY is missing. Set it in your environment.")
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
-
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": "You write high-quality repo documentation in Markdown."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.2,
-        max_tokens=4096,
-        top_p=0.9,
-    )
+    with _llm_slots:
+        response = get_openai_client().chat.completions.create(
+            model=MODEL_NAME,
+            messages=[
+                {"role": "system", "content": "You write high-quality repo documentation in Markdown."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.2,
+            max_tokens=4096,
+            top_p=0.9,
+        )
 
     return response.choices[0].message.content
 
 
-def process_one_repo(repo):
-    """Process a single repository and generate documentation."""
+def load_state():
+    """Read the summary state file ({} if this is the first run)."""
+    if not STATE_FILE.exists():
+        return {}
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    """Atomically write the summary state file."""
+    tmp_path = STATE_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def load_pending_changes():
+    """Read the pending changed/removed summary paths ({"changed": [], "removed": []} if none)."""
+    if not CHANGED_FILE.exists():
+        return {"changed": [], "removed": []}
+    with open(CHANGED_FILE, "r", encoding="utf-8") as f:
+        pending = json.load(f)
+    return {"changed": pending.get("changed", []), "removed": pending.get("removed", [])}
+
+
+def save_pending_changes(changed, removed):
+    """
+    Atomically merge summary paths into the pending list. Entries accumulate
+    across runs until ingest_changed() clears them; paths are stored resolved.
+    """
+    pending = load_pending_changes()
+    changed = {str(pathlib.Path(p).resolve()) for p in changed}
+    removed = {str(pathlib.Path(p).resolve()) for p in removed}
+    pending_changed = (set(pending["changed"]) - removed) | changed
+    pending_removed = (set(pending["removed"]) - changed) | removed
+    tmp_path = CHANGED_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": datetime.utcnow().isoformat() + "Z", "changed": sorted(pending_changed),
+                   "removed": sorted(pending_removed)}, f, indent=2)
+    os.replace(tmp_path, CHANGED_FILE)
+    return pending_changed, pending_removed
+
+
+def prompt_hash(prompt):
+    return hashlib.sha256(f"{MODEL_NAME}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def _summary_current(entry, out_path):
+    """A state entry still describes the summary on disk with the current model and prompt."""
+    return (
+        bool(entry)
+        and entry.get("model") == MODEL_NAME
+        and entry.get("prompt_version") == PROMPT_VERSION
+        and entry.get("summary_path") == str(out_path)
+        and out_path.exists()
+    )
+
+
+def process_one_repo(repo, entry=None, force=False):
+    """
+    Process a single repository and generate documentation.
+
+    `entry` is the repo's previous state. Unless `force` is set, the repo is
+    skipped without any request when `pushed_at` is unchanged, and without the
+    LLM call when its tree SHA or prompt is unchanged.
+    """
     repo_full = repo["full_name"]
+    out_path = OUT_DIR / f"{safe_filename(repo['name'])}.md"
+    current = not force and _summary_current(entry, out_path)
     try:
-        branch = get_default_branch(repo_full)
-        tree = get_repo_tree(repo_full, branch)
-        meta, paths, file_blobs = build_repo_context(repo, tree)
+        if current and entry.get("pushed_at") == repo.get("pushed_at"):
+            return {"repo": repo_full, "ok": True, "skipped": True, "path": str(out_path),
+                    "state": entry, "requests": request_counts[repo_full]}
+
+        branch = repo_branch(repo)
+        tree_sha, tree = fetch_tree(repo_full, branch)
+        state = dict(entry or {}, pushed_at=repo.get("pushed_at"), tree_sha=tree_sha)
+        if current and entry.get("tree_sha") == tree_sha:
+            return {"repo": repo_full, "ok": True, "skipped": True, "path": str(out_path),
+                    "state": state, "requests": request_counts[repo_full]}
+
+        meta, paths, file_blobs = build_repo_context(repo, tree, branch)
         prompt = make_prompt(meta, paths, file_blobs)
-        md = generate_markdown_with_openai(prompt)
+        digest = prompt_hash(prompt)
+        if current and entry.get("prompt_hash") == digest:
+            return {"repo": repo_full, "ok": True, "skipped": True, "path": str(out_path),
+                    "state": dict(state, prompt_hash=digest), "requests": request_counts[repo_full]}
 
-        out_path = OUT_DIR / f"{safe_filename(repo['name'])}.md"
+        md = generate_markdown_with_openai(prompt)
         header = f"<!-- Generated: {datetime.utcnow().isoformat()}Z | Model: {MODEL_NAME} -->\n\n"
         out_path.write_text(header + md.strip() + "\n", encoding="utf-8")
 
-        return {"repo": repo_full, "ok": True, "path": str(out_path)}
+        state.update(summary_path=str(out_path), prompt_hash=digest, model=MODEL_NAME,
+                     prompt_version=PROMPT_VERSION)
+        return {"repo": repo_full, "ok": True, "skipped": False, "path": str(out_path),
+                "state": state, "requests": request_counts[repo_full]}
     except Exception as e:
-        return {"repo": repo_full, "ok": False, "error": str(e)}
+        return {"repo": repo_full, "ok": False, "error": str(e), "requests": request_counts[repo_full]}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate Markdown summaries of GitHub repositories")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Repositories processed at the same time (1 = sequential)")
+    parser.add_argument("--github-concurrency", type=int, default=DEFAULT_GITHUB_CONCURRENCY,
+                        help="Maximum simultaneous GitHub API requests")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="Maximum simultaneous OpenAI calls")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every summary, ignoring the state file")
+    parser.add_argument("--cache-dir", type=pathlib.Path, default=CACHE_DIR,
+                        help="Directory of the GitHub HTTP cache")
+    parser.add_argument("--no-cache", action="store_true", help="Do not cache GitHub responses")
+    parser.add_argument("--offline", action="store_true",
+                        help="Replay recorded GitHub responses from the cache; never call GitHub")
+    parser.add_argument("--cache-ttl", action="append", default=[], metavar="KIND=SECONDS",
+                        help=f"Override a cache TTL; kinds: {', '.join(DEFAULT_TTLS)}")
+    return parser.parse_args()
+
+
+def report(result):
+    if result["ok"] and result["skipped"]:
+        tqdm.write(f"⏭️ {result['repo']} unchanged ({result['requests']} GitHub requests)")
+    elif result["ok"]:
+        tqdm.write(f"✅ {result['repo']} -> {result['path']} ({result['requests']} GitHub requests)")
+    else:
+        tqdm.write(f"⚠️ {result['repo']} failed: {result['error']} ({result['requests']} GitHub requests)")
 
 
 def main():
-    """Fetch all repos and process with progress tracking."""
+    """Fetch all repos and process them on a bounded worker pool; summaries are written as they finish."""
+    args = parse_args()
+    configure_concurrency(github=args.github_concurrency, llm=args.llm_concurrency)
+    ttls = {kind: float(seconds) for kind, seconds in (item.split("=", 1) for item in args.cache_ttl)}
+    configure_cache(args.cache_dir, offline=args.offline, ttls=ttls, enabled=not args.no_cache)
+
     # Validate required configuration
     if not GITHUB_USERNAME:
         raise RuntimeError("GITHUB_USERNAME environment variable is not set.")
@@ -321,13 +678,41 @@ def main():
     repos = list_repos(GITHUB_USERNAME)
     print(f"Found {len(repos)} repos for @{GITHUB_USERNAME}")
 
-    for repo in tqdm(repos, desc="Processing repositories"):
-        result = process_one_repo(repo)
-        if result["ok"]:
-            print(f"✅ {result['repo']} -> {result['path']}")
-        else:
-            print(f"⚠️ {result['repo']} failed: {result['error']}")
-    
+    state = load_state()
+    changed = []
+    with ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="repo") as pool:
+        futures = [pool.submit(process_one_repo, repo, state.get(repo["full_name"]), args.force) for repo in repos]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing repositories"):
+            result = future.result()
+            report(result)
+            if result["ok"]:
+                # Saved after every repo so an interrupted run keeps its progress
+                state[result["repo"]] = result["state"]
+                save_state(state)
+                if not result["skipped"]:
+                    changed.append(result["path"])
+
+    # Repos that no longer exist: drop their summaries so ingestion can delete their chunks
+    listed = {repo["full_name"] for repo in repos}
+    removed = []
+    for repo_full in [name for name in state if name not in listed]:
+        summary_path = state.pop(repo_full).get("summary_path")
+        if summary_path:
+            pathlib.Path(summary_path).unlink(missing_ok=True)
+            removed.append(summary_path)
+    if removed:
+        save_state(state)
+
+    pending_changed, pending_removed = save_pending_changes(changed, removed)
+    print(f"\n{len(changed)} summaries generated, {len(repos) - len(changed)} unchanged or failed, "
+          f"{len(removed)} removed")
+    print(f"Pending for ingestion ({len(pending_changed)} changed, {len(pending_removed)} removed): {CHANGED_FILE}")
+
+    total = sum(request_counts.values())
+    print(f"\nGitHub requests: {total} total, {total / max(1, len(repos)):.1f} per repo")
+    if http_cache is not None:
+        print(f"HTTP cache: {http_cache.stats['hits']} hits, {http_cache.stats['revalidated']} revalidated (304), "
+              f"{http_cache.stats['misses']} misses")
     print(f"\n{'='*60}")
     print(f"Documentation saved to: {OUT_DIR}")
     print(f"{'='*60}")
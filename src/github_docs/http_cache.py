@@ -0,0 +1,162 @@
+"""
+On-disk HTTP cache for GitHub API GET requests
+
+Responses are stored as JSON files keyed by URL and query parameters. A
+cached response younger than the TTL for its endpoint kind is returned
+without a request; an older one is revalidated with If-None-Match /
+If-Modified-Since, and GitHub's 304 answers do not count against the rate
+limit. In offline mode only the cache is used, so a recorded run can be
+replayed without network access.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import pathlib
+import threading
+
+# Seconds a cached response is used without revalidation, per endpoint kind.
+# Trees, contents and tarballs are addressed by branch name and change on push,
+# so they are always revalidated: a 304 is free for API endpoints, and for a
+# tarball it still costs the API redirect but skips the download.
+DEFAULT_TTLS = {
+    "repo_list": 600,
+    "repo": 3600,
+    "tree": 0,
+    "contents": 0,
+    "tarball": 0,
+    "default": 0,
+}
+
+_ENDPOINT_KINDS = [
+    ("repo_list", re.compile(r"/users/[^/]+/repos$")),
+    ("tree", re.compile(r"/repos/[^/]+/[^/]+/git/trees/")),
+    ("contents", re.compile(r"/repos/[^/]+/[^/]+/contents/")),
+    ("tarball", re.compile(r"/repos/[^/]+/[^/]+/tarball/")),
+    ("repo", re.compile(r"/repos/[^/]+/[^/]+$")),
+]
+
+
+class CacheMiss(RuntimeError):
+    """Raised in offline mode when a request has no recorded response."""
+
+
+def endpoint_kind(url):
+    """Classify a GitHub API URL for TTL lookup."""
+    path = url.split("?", 1)[0].rstrip("/")
+    for kind, pattern in _ENDPOINT_KINDS:
+        if pattern.search(path):
+            return kind
+    return "default"
+
+
+class HTTPCache:
+    """Persistent conditional-request cache (thread-safe)."""
+
+    def __init__(self, cache_dir, ttls=None, offline=False):
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.offline = offline
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, url, params):
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _read(self, path):
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, entry):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _usable(self, entry, url):
+        return entry is not None and (
+            self.offline or time.time() - entry["stored_at"] < self.ttls[endpoint_kind(url)]
+        )
+
+    def get_json(self, url, params, send):
+        """
+        JSON body of GET `url`, from the cache when possible.
+
+        `send(url, params, headers)` performs the actual request and returns a
+        requests.Response; it is only called when the cache cannot answer.
+        """
+        path = self._path(url, params)
+        entry = self._read(path)
+        if self._usable(entry, url):
+            self._count("hits")
+            return entry["body"]
+        if self.offline:
+            raise CacheMiss(f"No recorded response for {url} {params or ''}")
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = send(url, params, headers)
+        if response.status_code == 304 and entry:
+            entry["stored_at"] = time.time()
+            self._write(path, entry)
+            self._count("revalidated")
+            return entry["body"]
+        response.raise_for_status()
+        body = response.json()
+        self._write(path, {
+            "url": url,
+            "params": params,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": body,
+        })
+        self._count("misses")
+        return body
+
+    def remember(self, url, params, compute):
+        """
+        Cache a value derived from a response that is not returned as JSON
+        (e.g. files read from a streamed tarball), so offline runs can replay it.
+
+        `compute(etag)` makes the request, sending If-None-Match when `etag`
+        is given. It returns None if the server answered 304, otherwise
+        (value, etag of the response).
+        """
+        path = self._path(url, params)
+        entry = self._read(path)
+        if self._usable(entry, url):
+            self._count("hits")
+            return entry["body"]
+        if self.offline:
+            raise CacheMiss(f"No recorded response for {url} {params or ''}")
+        result = compute(entry.get("etag") if entry else None)
+        if result is None and entry:
+            entry["stored_at"] = time.time()
+            self._write(path, entry)
+            self._count("revalidated")
+            return entry["body"]
+        if result is None:
+            result = compute(None)
+        body, etag = result
+        self._write(path, {"url": url, "params": params, "etag": etag, "stored_at": time.time(), "body": body})
+        self._count("misses")
+        return body
@@ -0,0 +1,183 @@
+"""
+Lexical Index - BM25 inverted index over the chunks in the vector store
+
+Built next to the Chroma collection during ingestion (same chunk ids) and
+persisted as SQLite tables (postings and document lengths) in
+vectors/bm25_index.sqlite, so ingestion updates it row by row instead of
+holding the whole index in memory. It catches exact identifiers such as
+course codes, repo names and certificate titles that dense retrieval misses.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from src.utils.filters import matches_filter
+
+INDEX_FILE = "bm25_index.sqlite"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._\-/][a-z0-9]+)*")
+_PART_RE = re.compile(r"[._\-/]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens; compound identifiers (``enpm-673``, ``llm_rag``)
+    are kept whole, joined (``enpm673``) and split into their parts.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        parts = _PART_RE.split(token)
+        if len(parts) > 1:
+            tokens.append("".join(parts))
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """
+    Incrementally updatable BM25 index keyed by chunk id
+
+    Changes made with add() and remove() form one transaction that save()
+    commits, so an interrupted ingestion leaves the previous index intact.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, length INTEGER NOT NULL, metadata TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,
+                                             PRIMARY KEY (term, doc_id)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+        CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO stats VALUES ('docs', 0), ('length', 0);
+    """
+
+    def __init__(self, path=":memory:", k1: float = 1.5, b: float = 0.75):
+        """
+        Open (or create) an index
+
+        Args:
+            path: SQLite file (default: a private in-memory index)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.path = str(path)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        if self.path != ":memory:":
+            # Readers (the app) keep working while an ingestion is writing
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        created = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats'").fetchone()
+        if not created:
+            # Skipped when the tables exist, so opening never waits on a running ingestion
+            self._conn.executescript(self.SCHEMA)
+
+    def _stats(self) -> Tuple[int, int]:
+        values = dict(self._conn.execute("SELECT key, value FROM stats"))
+        return values["docs"], values["length"]
+
+    def __len__(self):
+        with self._lock:
+            return self._stats()[0]
+
+    def add(self, ids: List[str], texts: List[str], metadata: List[Dict] = None):
+        """Index texts (and their metadata, for filtering) under ids; existing ids are replaced"""
+        with self._lock:
+            self._remove(ids)
+            added = total = 0
+            for i, (doc_id, text) in enumerate(zip(ids, texts)):
+                tokens = tokenize(text)
+                self._conn.execute("INSERT INTO docs VALUES (?, ?, ?)",
+                                   (doc_id, len(tokens), json.dumps(metadata[i] if metadata else {})))
+                self._conn.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                                       [(term, doc_id, tf) for term, tf in Counter(tokens).items()])
+                added += 1
+                total += len(tokens)
+            self._bump(added, total)
+
+    def _bump(self, docs: int, length: int):
+        self._conn.execute("UPDATE stats SET value = value + ? WHERE key = 'docs'", (docs,))
+        self._conn.execute("UPDATE stats SET value = value + ? WHERE key = 'length'", (length,))
+
+    def _remove(self, ids: Iterable[str]):
+        removed = total = 0
+        for doc_id in ids:
+            row = self._conn.execute("SELECT length FROM docs WHERE id = ?", (doc_id,)).fetchone()
+            if row is None:
+                continue
+            self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+            removed += 1
+            total += row[0]
+        self._bump(-removed, -total)
+
+    def remove(self, ids: Iterable[str]):
+        """Drop ids from the index (unknown ids are ignored)"""
+        with self._lock:
+            self._remove(ids)
+
+    def clear(self):
+        """Drop every document (committed by the next save())"""
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM docs")
+            self._conn.execute("UPDATE stats SET value = 0")
+
+    def search(self, query: str, k: int = 10, filter: Dict = None) -> List[Tuple[str, float]]:
+        """Top-k (chunk id, BM25 score) pairs for a query, optionally within a metadata filter"""
+        with self._lock:
+            n, total_length = self._stats()
+            if not n:
+                return []
+            avg_length = total_length / n
+            scores = Counter()
+            allowed = {}
+            for term in set(tokenize(query)):
+                posting = self._conn.execute(
+                    "SELECT p.doc_id, p.tf, d.length, d.metadata FROM postings p JOIN docs d ON d.id = p.doc_id "
+                    "WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf, length, metadata in posting:
+                    if filter:
+                        if doc_id not in allowed:
+                            allowed[doc_id] = matches_filter(json.loads(metadata), filter)
+                        if not allowed[doc_id]:
+                            continue
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores.most_common(k)
+
+    def save(self, db_path=None):
+        """
+        Commit pending changes; an index opened elsewhere (e.g. in memory)
+        is copied to <db_path>/bm25_index.sqlite
+        """
+        with self._lock:
+            self._conn.commit()
+            if db_path is None:
+                return
+            target = Path(db_path) / INDEX_FILE
+            if self.path != ":memory:" and Path(self.path).resolve() == target.resolve():
+                return
+            target.parent.mkdir(parents=True, exist_ok=True)
+            destination = sqlite3.connect(target)
+            try:
+                self._conn.backup(destination)
+            finally:
+                destination.close()
+
+    @classmethod
+    def load(cls, db_path) -> "BM25Index":
+        """Open the index in <db_path>; an empty index if none was built yet"""
+        Path(db_path).mkdir(parents=True, exist_ok=True)
+        return cls(Path(db_path) / INDEX_FILE)
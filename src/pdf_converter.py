@@ -6,15 +6,23 @@ It handles text extraction from PDFs with error handling for encrypted and image
 
 Usage:
     python pdf_converter.py --input data/raw --output data/processed/pdf_markdown
+    python pdf_converter.py --workers 8   # extract PDFs in parallel
     or import and use directly:
     from src.pdf_converter import convert_all_pdfs
 """
 
 import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Tuple
 import pdfplumber
 import logging
+from tqdm import tqdm
 
 # Configure logging
 logging.basicConfig(
@@ -24,12 +32,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def pdf_to_text(pdf_path: Path) -> str:
+def pdf_to_text(pdf_path: Path, probe_pages: int = 0) -> str:
     """
     Extract text from a PDF file.
     
     Args:
         pdf_path: Path to the PDF file
+        probe_pages: If > 0, give up early (return "") when none of the
+            first probe_pages pages has text, i.e. the PDF is image-based
         
     Returns:
         Extracted text from all pages joined with double newlines
@@ -37,79 +47,347 @@ def pdf_to_text(pdf_path: Path) -> str:
     Raises:
         Exception: If PDF is encrypted or cannot be read
     """
-    text_parts = []
+    return "\n\n".join(extract_pages(pdf_path, probe_pages=probe_pages)).strip()
+
+
+def extract_pages(pdf_path: Path, start: int = 0, end: int = None, probe_pages: int = 0) -> List[str]:
+    """
+    Extract the text of pages [start, end) from a PDF file.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        start: First page index (0-based)
+        end: Page index to stop before (default: last page)
+        probe_pages: When extracting a whole document, stop after the first
+            probe_pages pages if none of them has text (0 = never probe)
+        
+    Returns:
+        Text of each page in the range ("" for pages without text)
+    """
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text_parts.append(page_text)
-    return "\n\n".join(text_parts).strip()
+        pages = pdf.pages[start:end]
+        if not probe_pages or start != 0 or end is not None:
+            return [page.extract_text() or "" for page in pages]
+        probed = [page.extract_text() or "" for page in pages[:probe_pages]]
+        if not any(text.strip() for text in probed):
+            return probed
+        return probed + [page.extract_text() or "" for page in pages[probe_pages:]]
+
+
+def _extract_task(pdf_path: Path, start: int, end: int, probe_pages: int = 0) -> Tuple[List[str], float]:
+    """Process-pool worker: extract a page range and time it."""
+    began = time.perf_counter()
+    pages = extract_pages(pdf_path, start, end, probe_pages)
+    return pages, time.perf_counter() - began
+
+
+def _plan_tasks(pdf_files: List[Path], pages_per_task: int, split_min_bytes: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Split the work into (file index, part index, start page, end page) tasks.
+    
+    Files smaller than split_min_bytes are one task; larger files are split
+    into ranges of pages_per_task pages.
+    """
+    tasks = []
+    for file_index, pdf_path in enumerate(pdf_files):
+        page_count = None
+        if pages_per_task and pdf_path.stat().st_size >= split_min_bytes:
+            try:
+                with pdfplumber.open(pdf_path) as pdf:
+                    page_count = len(pdf.pages)
+            except Exception:
+                page_count = None  # let the worker report the error
+        if not page_count or page_count <= pages_per_task:
+            tasks.append((file_index, 0, 0, None))
+            continue
+        for part, start in enumerate(range(0, page_count, pages_per_task)):
+            tasks.append((file_index, part, start, start + pages_per_task))
+    return tasks
+
+
+MANIFEST_NAME = ".conversion_manifest.json"
+# Failures of the machine rather than the PDF: the previous output is kept
+INFRASTRUCTURE_ERRORS = (BrokenProcessPool, MemoryError, OSError)
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's bytes, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
-def convert_all_pdfs(input_dir: Path, output_dir: Path) -> Dict[str, int]:
+def load_manifest(output_dir: Path) -> Dict[str, Dict]:
+    """
+    Load the conversion manifest (resolved PDF path -> size/mtime/sha256/status/output).
+    
+    Entries from older manifests keyed by input-relative paths are dropped,
+    so those PDFs are converted once more.
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {source: entry for source, entry in manifest.items() if Path(source).is_absolute()}
+
+
+def save_manifest(output_dir: Path, manifest: Dict[str, Dict]) -> None:
+    """Atomically write the conversion manifest."""
+    manifest_path = output_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _is_unchanged(pdf_path: Path, out_path: Path, entry: Dict, probe_pages: int = 0) -> bool:
+    """
+    Check a PDF against its manifest entry.
+    
+    Size and mtime matching is enough; if only the mtime moved, the content
+    hash decides (and the entry's mtime is refreshed). A "no_text" status
+    that came from probing only the first pages is re-checked unless this
+    run probes no more pages than the one that recorded it.
+    """
+    if not entry:
+        return False
+    if entry.get("status", "").startswith("error:"):
+        return False  # always retry failures
+    if entry.get("status") == "success" and not out_path.exists():
+        return False
+    probed = entry.get("probe_pages")
+    if entry.get("status") == "no_text" and probed and (not probe_pages or probe_pages > probed):
+        return False
+    stat = pdf_path.stat()
+    if stat.st_size != entry.get("size"):
+        return False
+    if stat.st_mtime == entry.get("mtime"):
+        return True
+    if file_sha256(pdf_path) == entry.get("sha256"):
+        entry["mtime"] = stat.st_mtime
+        return True
+    return False
+
+
+def _write_output(text: str, rel_path: Path, out_path: Path, stats: Dict[str, int]) -> str:
+    """Write one converted file, update the counters and return its status."""
+    if not text:
+        logger.warning(f"[SKIP] No text extracted: {rel_path}")
+        stats["no_text"] += 1
+        out_path.unlink(missing_ok=True)
+        return "no_text"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(text, encoding="utf-8")
+    logger.info(f"[OK] {rel_path}")
+    stats["success"] += 1
+    return "success"
+
+
+def _record_error(rel_path: Path, out_path: Path, error: Exception, stats: Dict[str, int]) -> str:
+    """Log a failed PDF and return its status; its output is only deleted if the PDF itself is at fault."""
+    name = type(error).__name__
+    logger.error(f"[ERROR] {rel_path}: {name}")
+    stats["errors"] += 1
+    if not isinstance(error, INFRASTRUCTURE_ERRORS):
+        out_path.unlink(missing_ok=True)
+    return f"error:{name}"
+
+
+def convert_all_pdfs(input_dir: Path, output_dir: Path, workers: int = 1,
+                     pages_per_task: int = 20, split_min_bytes: int = 2_000_000,
+                     timings: Dict[str, float] = None, force: bool = False,
+                     probe_pages: int = 0, analysis: Dict = None) -> Dict[str, int]:
     """
     Convert all PDFs in input directory to Markdown files.
     
     Recursively processes PDFs while maintaining folder structure.
-    Errors are logged but do not halt processing.
+    Errors are logged but do not halt processing. With workers > 1 whole
+    PDFs (and page ranges of large PDFs) are extracted in a process pool;
+    outputs are still written in sorted file order.
+    
+    A manifest in the output directory records each source PDF's size,
+    mtime and content hash, keyed by its resolved path. Unchanged PDFs are
+    skipped, failed ones are retried, and outputs whose source PDF was
+    removed from under `input_dir` are deleted (entries from other input
+    directories are left alone).
+    
+    Passing an ``analysis`` dict fills it in the analyze_pdfs() format from
+    the same extraction pass (skipped PDFs use their recorded status), so
+    no PDF has to be opened twice.
     
     Args:
         input_dir: Root directory containing PDFs
         output_dir: Root directory for output Markdown files
+        workers: Number of worker processes (1 = in-process)
+        pages_per_task: Pages per task when splitting large PDFs (0 = never split)
+        split_min_bytes: Only PDFs at least this large are split into page ranges
+        timings: Optional dict filled with extraction seconds per relative path
+        force: Convert every PDF, ignoring the manifest
+        probe_pages: Skip full extraction of PDFs whose first probe_pages
+            pages have no text (0 = always extract everything)
+        analysis: Optional dict filled with "convertible", "no_text" and
+            "encrypted" lists, as returned by analyze_pdfs()
         
     Returns:
         Dictionary with conversion statistics:
         {
             "success": int,      # Successfully converted
             "no_text": int,      # Image-based PDFs (no extractable text)
-            "errors": int        # Encrypted or other errors
+            "errors": int,       # Encrypted or other errors
+            "skipped": int,      # Unchanged since the last run
+            "removed": int       # Outputs deleted because the source PDF is gone
         }
     """
-    pdf_files = sorted(input_dir.rglob("*.pdf"))
-    if not pdf_files:
-        logger.warning("No PDF files found in input directory.")
-        return {"success": 0, "no_text": 0, "errors": 0}
-
+    stats = {"success": 0, "no_text": 0, "errors": 0, "skipped": 0, "removed": 0}
+    timings = {} if timings is None else timings
+    input_dir = input_dir.resolve()
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    success_count = 0
-    no_text_count = 0
-    error_count = 0
-    
-    logger.info(f"Found {len(pdf_files)} PDF(s) to process...")
-    
-    for pdf_path in pdf_files:
+    manifest = load_manifest(output_dir)
+    all_files = sorted(input_dir.rglob("*.pdf"))  # absolute, since input_dir is resolved
+
+    current = {str(pdf_path) for pdf_path in all_files}
+    under_input = [source for source in manifest if Path(source).is_relative_to(input_dir)]
+    for source in sorted(set(under_input) - current):
+        output = manifest.pop(source).get("output")
+        if output and (output_dir / output).exists():
+            (output_dir / output).unlink()
+            logger.info(f"[REMOVED] {output}")
+            stats["removed"] += 1
+
+    pdf_files = []
+    for pdf_path in all_files:
         rel_path = pdf_path.relative_to(input_dir)
         out_path = output_dir / rel_path.with_suffix(".md")
-        out_path.parent.mkdir(parents=True, exist_ok=True)
+        if not force and _is_unchanged(pdf_path, out_path, manifest.get(str(pdf_path)), probe_pages):
+            stats["skipped"] += 1
+        else:
+            pdf_files.append(pdf_path)
 
-        try:
-            text = pdf_to_text(pdf_path)
-            if not text:
-                logger.warning(f"[SKIP] No text extracted: {rel_path}")
-                no_text_count += 1
+    if not all_files:
+        logger.warning("No PDF files found in input directory.")
+    if not pdf_files:
+        save_manifest(output_dir, manifest)
+        if analysis is not None:
+            analysis.update(_analysis_from_manifest(manifest, input_dir))
+        return stats
+
+    logger.info(f"Found {len(all_files)} PDF(s), {len(pdf_files)} to process...")
+    rel_paths = [pdf_path.relative_to(input_dir) for pdf_path in pdf_files]
+    out_paths = [output_dir / rel_path.with_suffix(".md") for rel_path in rel_paths]
+    outcomes = [None] * len(pdf_files)
+
+    if workers <= 1:
+        for i, pdf_path in enumerate(tqdm(pdf_files, desc="Converting PDFs", unit="pdf")):
+            began = time.perf_counter()
+            try:
+                text = pdf_to_text(pdf_path, probe_pages)
+            except Exception as e:
+                outcomes[i] = _record_error(rel_paths[i], out_paths[i], e, stats)
                 continue
+            finally:
+                timings[str(rel_paths[i])] = time.perf_counter() - began
+            outcomes[i] = _write_output(text, rel_paths[i], out_paths[i], stats)
+    else:
+        tasks = _plan_tasks(pdf_files, pages_per_task, split_min_bytes)
+        parts_expected = [0] * len(pdf_files)
+        for file_index, _, _, _ in tasks:
+            parts_expected[file_index] += 1
+        parts = [dict() for _ in pdf_files]
+        errors = [None] * len(pdf_files)
+        next_to_write = 0
 
-            out_path.write_text(text, encoding="utf-8")
-            logger.info(f"[OK] {rel_path}")
-            success_count += 1
-            
-        except Exception as e:
-            logger.error(f"[ERROR] {rel_path}: {type(e).__name__}")
-            error_count += 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_extract_task, pdf_files[file_index], start, end, probe_pages): (file_index, part)
+                for file_index, part, start, end in tasks
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Converting PDFs", unit="task"):
+                file_index, part = futures[future]
+                key = str(rel_paths[file_index])
+                try:
+                    pages, seconds = future.result()
+                    timings[key] = timings.get(key, 0.0) + seconds
+                    parts[file_index][part] = pages
+                except Exception as e:
+                    errors[file_index] = errors[file_index] or e
+                    parts[file_index][part] = None
 
-    return {
-        "success": success_count,
-        "no_text": no_text_count,
-        "errors": error_count
-    }
+                # Flush every finished file in sorted order as soon as its predecessors are done
+                while next_to_write < len(pdf_files) and len(parts[next_to_write]) == parts_expected[next_to_write]:
+                    i = next_to_write
+                    if errors[i]:
+                        outcomes[i] = _record_error(rel_paths[i], out_paths[i], errors[i], stats)
+                    else:
+                        pages = [page for p in sorted(parts[i]) for page in parts[i][p]]
+                        outcomes[i] = _write_output("\n\n".join(pages).strip(), rel_paths[i], out_paths[i], stats)
+                    parts[i] = {}
+                    next_to_write += 1
+
+    for pdf_path, rel_path, out_path, status in zip(pdf_files, rel_paths, out_paths, outcomes):
+        stat = pdf_path.stat()
+        manifest[str(pdf_path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": file_sha256(pdf_path),
+            "status": status,
+            # An output kept after an infrastructure error is still tracked, so it is pruned with its PDF
+            "output": str(rel_path.with_suffix(".md")) if out_path.exists() else None,
+        }
+        if status == "no_text" and probe_pages:
+            manifest[str(pdf_path)]["probe_pages"] = probe_pages
+    save_manifest(output_dir, manifest)
+    if analysis is not None:
+        analysis.update(_analysis_from_manifest(manifest, input_dir))
+    return stats
 
 
-def analyze_pdfs(input_dir: Path) -> Dict[str, any]:
+def _analysis_from_manifest(manifest: Dict[str, Dict], input_dir: Path) -> Dict[str, List]:
+    """Build an analyze_pdfs()-style report from recorded statuses of the PDFs under input_dir."""
+    results = {"convertible": [], "no_text": [], "encrypted": []}
+    for source in sorted(manifest):
+        if not Path(source).is_relative_to(input_dir):
+            continue
+        rel = str(Path(source).relative_to(input_dir))
+        status = manifest[source].get("status") or ""
+        if status == "success":
+            results["convertible"].append(rel)
+        elif status == "no_text":
+            results["no_text"].append(rel)
+        else:
+            results["encrypted"].append((rel, status.partition(":")[2] or "Error"))
+    return results
+
+
+def print_timing_summary(timings: Dict[str, float], top: int = 10) -> None:
+    """
+    Print the slowest documents and the total extraction time.
+    
+    Args:
+        timings: Extraction seconds per relative path (from convert_all_pdfs)
+        top: Number of documents to list
+    """
+    if not timings:
+        return
+    total = sum(timings.values())
+    print(f"\nSlowest documents (extraction time, {total:.1f}s total):")
+    for path, seconds in sorted(timings.items(), key=lambda x: x[1], reverse=True)[:top]:
+        print(f"  {seconds:7.2f}s  {100 * seconds / total:5.1f}%  {path}")
+
+
+def analyze_pdfs(input_dir: Path, probe_pages: int = 0) -> Dict[str, any]:
     """
     Analyze all PDFs and categorize them by conversion status.
     
+    To analyze and convert in one pass, use
+    convert_all_pdfs(..., analysis={}) instead.
+    
     Args:
         input_dir: Root directory containing PDFs
+        probe_pages: Classify a PDF as image-based as soon as its first
+            probe_pages pages have no text (0 = extract everything)
         
     Returns:
         Dictionary with categorized PDF paths:
@@ -135,12 +413,11 @@ def analyze_pdfs(input_dir: Path) -> Dict[str, any]:
     for pdf_path in pdf_files:
         rel_path = pdf_path.relative_to(input_dir)
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text = "\n\n".join([page.extract_text() or "" for page in pdf.pages]).strip()
-                if text:
-                    results["convertible"].append(str(rel_path))
-                else:
-                    results["no_text"].append(str(rel_path))
+            text = pdf_to_text(pdf_path, probe_pages)
+            if text:
+                results["convertible"].append(str(rel_path))
+            else:
+                results["no_text"].append(str(rel_path))
         except Exception as e:
             results["encrypted"].append((str(rel_path), type(e).__name__))
     
@@ -198,6 +475,28 @@ def main():
         default=Path("data/processed/pdf_markdown"),
         help="Output directory for Markdown files (default: data/processed/pdf_markdown)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for extraction (default: 1)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-convert every PDF, even if unchanged since the last run"
+    )
+    parser.add_argument(
+        "--probe-pages",
+        type=int,
+        default=0,
+        help="Treat a PDF as image-based if its first N pages have no text (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Also print the analysis report, from the same extraction pass as the conversion"
+    )
     parser.add_argument(
         "--analyze-only",
         action="store_true",
@@ -214,16 +513,24 @@ def main():
     
     if args.analyze_only:
         logger.info("Analyzing PDFs...")
-        analysis = analyze_pdfs(input_dir)
+        analysis = analyze_pdfs(input_dir, probe_pages=args.probe_pages)
         print_analysis_report(input_dir, analysis)
     else:
         logger.info(f"Converting PDFs from {input_dir} to {output_dir}...")
-        stats = convert_all_pdfs(input_dir, output_dir)
+        timings = {}
+        analysis = {} if args.report else None
+        stats = convert_all_pdfs(input_dir, output_dir, workers=args.workers, timings=timings,
+                                 force=args.force, probe_pages=args.probe_pages, analysis=analysis)
+        if analysis is not None:
+            print_analysis_report(input_dir, analysis)
         print(f"\nConversion Summary:")
         print(f"  Successfully converted: {stats['success']}")
         print(f"  Image-based (no text):  {stats['no_text']}")
         print(f"  Errors/Encrypted:       {stats['errors']}")
-        print(f"  Total processed:        {sum(stats.values())}")
+        print(f"  Unchanged (skipped):    {stats['skipped']}")
+        print(f"  Removed outputs:        {stats['removed']}")
+        print(f"  Total processed:        {stats['success'] + stats['no_text'] + stats['errors']}")
+        print_timing_summary(timings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+"""
+Query Router - Guess which document folders a question is about
+
+Chunks carry a `type` metadata field (the lowercased source folder, see
+src.data_ingestion). Keyword rules map a question to the likely types so
+retrieval can be restricted with a metadata filter. Questions that match
+no rule are not routed and search the whole collection.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# type (source folder) -> keywords / phrases that point at it
+ROUTES = {
+    "resume": ["resume", "cv", "skills", "skill set", "tech stack", "work experience", "contact"],
+    "transcripts": ["transcript", "gpa", "cgpa", "grade", "grades", "marks", "mark sheet", "semester",
+                    "courses", "coursework", "10th", "12th", "wes"],
+    "internships": ["internship", "internships", "intern", "interned", "work experience"],
+    "research_papers": ["paper", "papers", "publication", "publications", "published", "journal",
+                        "conference", "research", "abstract", "co-author", "coauthor"],
+    "repo_summaries": ["repo", "repos", "repository", "repositories", "github", "project", "projects",
+                       "codebase", "implementation"],
+    "academic achievements": ["achievement", "achievements", "award", "awards", "olympiad", "degree",
+                              "certificate of completion", "certification", "certifications", "prize"],
+    "research integrity course certificates": ["research integrity", "integrity course", "epigeum"],
+    "extra cariculam": ["extracurricular", "extra curricular", "extra-curricular", "hobby", "hobbies",
+                        "sports", "chess", "basketball", "poetry", "drawing", "yoga", "yogathon",
+                        "fashion", "parliament", "competition"],
+}
+
+_PATTERNS = {
+    doc_type: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+    for doc_type, keywords in ROUTES.items()
+}
+
+
+def route_types(question: str, max_types: int = 3) -> List[str]:
+    """
+    Types whose keywords appear in the question, most matches first.
+    Empty when nothing matches or the question is too broad (> max_types).
+    """
+    hits = {}
+    for doc_type, pattern in _PATTERNS.items():
+        count = len(pattern.findall(question))
+        if count:
+            hits[doc_type] = count
+    if not hits or len(hits) > max_types:
+        return []
+    return sorted(hits, key=hits.get, reverse=True)
+
+
+def route_query(question: str, max_types: int = 3) -> Optional[Dict]:
+    """Chroma `where` filter on `type` for the question, or None to search everything"""
+    types = route_types(question, max_types)
+    if not types:
+        return None
+    if len(types) == 1:
+        return {"type": types[0]}
+    return {"type": {"$in": types}}
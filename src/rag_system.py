@@ -1,54 +1,78 @@
-from openai import OpenAI
-from langchain_community.llms import Ollama
-from langchain_core.messages import SystemMessage, HumanMessage
-
-
+import itertools
+import re
 
-# Initialize Llama 3.2 via Ollama
+from langchain_core.documents import Document
+from langchain_core.messages import SystemMessage, HumanMessage
+from src.registry import default_db_path, get_lexical_index, get_ollama_client, get_ollama_llm, get_reranker
+from src.reranker import RankOrder
+from src.utils.config import load_section
+from src.utils.hashing import chunk_id, text_hash
+from src.utils.tokens import count_tokens
 
-ollama_host = "http://localhost:11434"  # Adjust if your Ollama server is running on a different URL or port
-ollama_base_url = f"{ollama_host}/v1"
-ollama_model="llama3.2"
-ollama_client = OpenAI(base_url=ollama_base_url, api_key="ollama")
-llm = Ollama(model="llama3.2", base_url=ollama_host, temperature=0)
 
-from pydantic import BaseModel,Field
+def __getattr__(name):
+    # Ollama clients are created lazily by src.registry on first access.
+    if name == "ollama_client":
+        return get_ollama_client()
+    if name == "llm":
+        return get_ollama_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-class RankOrder(BaseModel):
-   order: list[int] = Field(description="he order of relevance of chunks, from most relevant to least relevant, by chunk id number")
 
 def rerank(question, chunks):
-    system_prompt = """
-You are a document re-ranker.
-You are provided with a question and a list of relevant chunks of text from a query of a knowledge base.
-The chunks are provided in the order they were retrieved; this should be approximately ordered by relevance, but you may be able to improve on that.
-You must rank order the provided chunks by relevance to the question, with the most relevant chunk first.
-Reply only with the list of ranked chunk ids, nothing else. Include all the chunk ids you are provided with, reranked.
-strictly reply do not leave the order empty and do not add or remove any chunk ids.
-"""
-    user_prompt = f"The user has asked the following question:\n\n{question}\n\nOrder all the chunks of text by relevance to the question, from most relevant to least relevant. Include all the chunk ids you are provided with, reranked.\n\n"
-    user_prompt += "Here are the chunks:\n\n"
-    for index, chunk in enumerate(chunks):
-        user_prompt += f"# CHUNK ID: {index + 1}:\n\n{chunk.page_content}\n\n"
-    user_prompt += "Reply only with the list of ranked chunk ids, nothing else."
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
-    ]
-    response = ollama_client.chat.completions.parse(
-        model="llama3.1",
-        messages=messages,
-        response_format=RankOrder,
-    )
-    parsed = response.choices[0].message.parsed
-    order = parsed.order
-    return [chunks[i - 1] for i in order if isinstance(i, int) and 1 <= i <= len(chunks)]
-
-
-
-def fetch_unranked_chunks(question, retriever):
-    relevant_chunks = retriever.invoke(question)
-    return relevant_chunks
+    return get_reranker().rerank(question, chunks)
+
+
+def hybrid_settings():
+    """The `hybrid_retrieval` config section (BM25 + dense fusion)"""
+    return load_section("hybrid_retrieval", {
+        "enabled": True,
+        "bm25_top_k": 10,
+        "rrf_k": 60,
+        "fused_top_k": 8,
+    })
+
+
+def reciprocal_rank_fusion(ranked_ids, k=60):
+    """
+    Fuse several ranked id lists: score(id) = sum over lists of 1 / (k + rank).
+    Returns ids ordered by fused score.
+    """
+    scores = {}
+    for ids in ranked_ids:
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def fetch_unranked_chunks(question, retriever, filter=None):
+    """
+    Dense retrieval, fused with BM25 keyword hits when hybrid retrieval is
+    enabled. Exact identifiers (course codes, repo names) that embeddings
+    miss are pulled in, and only `fused_top_k` candidates go on to reranking.
+
+    `filter` is a Chroma `where` clause on chunk metadata (see
+    src.query_router); if nothing matches it the search is repeated unfiltered.
+    """
+    relevant_chunks = retriever.invoke(question, filter=filter) if filter else retriever.invoke(question)
+    if filter and not relevant_chunks:
+        return fetch_unranked_chunks(question, retriever)
+    settings = hybrid_settings()
+    if not settings["enabled"]:
+        return relevant_chunks
+    vectorstore = retriever.vectorstore
+    lexical = get_lexical_index(getattr(vectorstore, "_persist_directory", None) or default_db_path())
+    if not len(lexical):
+        return relevant_chunks
+
+    by_id = {chunk_id(chunk): chunk for chunk in relevant_chunks}
+    lexical_ids = [doc_id for doc_id, _ in lexical.search(question, settings["bm25_top_k"], filter=filter)]
+    fused = reciprocal_rank_fusion([list(by_id), lexical_ids], k=settings["rrf_k"])[:settings["fused_top_k"]]
+    missing = [doc_id for doc_id in fused if doc_id not in by_id]
+    if missing:
+        for chunk in vectorstore.get_by_ids(missing):
+            by_id[chunk.id] = chunk
+    return [by_id[doc_id] for doc_id in fused if doc_id in by_id]
 
 
 def rewrite_query(question, history=[]):
@@ -68,14 +92,96 @@ Rules:
 - Do not mention document names, file paths, or the knowledge base.
 - If the question asks about a person, include their full name if known; otherwise keep the subject generic.
 """
-    reresponse = llm.invoke([SystemMessage(content=message), HumanMessage(content=question)])
+    reresponse = get_ollama_llm().invoke([SystemMessage(content=message), HumanMessage(content=question)])
     return reresponse
 
-def merge_chunks(chunks, reranked):
-    merged = chunks[:] 
-    existing = [chunk.page_content for chunk in chunks]
-    for chunk in reranked:
-        if chunk.page_content not in existing:
-            merged.append(chunk)
-    return merged
+_CHUNK_INDEX_RE = re.compile(r"-(\d+)$")
+
+
+def _overlap(previous, following, min_overlap, max_overlap):
+    """Length of the longest suffix of `previous` that starts `following` (0 if < min_overlap)"""
+    tail = previous[-max_overlap:]
+    probe = following[:min_overlap]
+    if len(probe) < min_overlap:
+        return 0
+    pos = tail.find(probe)
+    while pos != -1:
+        if following.startswith(tail[pos:]):
+            return len(tail) - pos
+        pos = tail.find(probe, pos + 1)
+    return 0
+
+
+def _collapse_overlaps(chunks, min_overlap, max_overlap, max_span_chars):
+    """
+    Join chunks of the same source whose text continues one another (the
+    splitter's chunk overlap) into a single span, kept at the position of
+    its first chunk.
+    """
+    by_source = {}
+    for position, chunk in enumerate(chunks):
+        by_source.setdefault(chunk.metadata.get("source"), []).append(position)
+
+    replaced, dropped = {}, set()
+    for positions in by_source.values():
+        if len(positions) < 2:
+            continue
+        # Chunk ids end in their index within the source (see embedder.source_chunk_ids)
+        indices = [_CHUNK_INDEX_RE.search(chunk_id(chunks[p])) for p in positions]
+        if all(indices):
+            positions = [p for _, p in sorted(zip((int(m.group(1)) for m in indices), positions))]
+        head = positions[0]
+        span = chunks[head].page_content
+        for position in positions[1:]:
+            text = chunks[position].page_content
+            overlap = _overlap(span, text, min_overlap, max_overlap)
+            if overlap and len(span) + len(text) - overlap <= max_span_chars:
+                span += text[overlap:]
+                dropped.add(position)
+                replaced[head] = span
+            else:
+                head, span = position, text
+
+    collapsed = []
+    for position, chunk in enumerate(chunks):
+        if position in dropped:
+            continue
+        if position in replaced:
+            chunk = Document(page_content=replaced[position], metadata=dict(chunk.metadata), id=chunk.id)
+        collapsed.append(chunk)
+    return collapsed
+
+
+def merge_chunks(chunks, reranked, stats=None, min_overlap=20, max_overlap=None, max_span_chars=2100):
+    """
+    Merge two retrieval results in one pass.
+
+    Exact duplicates are dropped by chunk id and content hash; chunks of the
+    same source that overlap (the splitter repeats up to `chunking.overlap`
+    characters between neighbours) are collapsed into one span. If `stats` is
+    given it receives the chunk counts and the prompt tokens saved.
+    """
+    if max_overlap is None:
+        max_overlap = load_section("chunking", {"overlap": 200})["overlap"]
+    merged, seen_ids, seen_hashes = [], set(), set()
+    for chunk in itertools.chain(chunks, reranked):
+        doc_id, digest = chunk_id(chunk), text_hash(chunk.page_content)
+        if doc_id in seen_ids or digest in seen_hashes:
+            continue
+        seen_ids.add(doc_id)
+        seen_hashes.add(digest)
+        merged.append(chunk)
+    collapsed = _collapse_overlaps(merged, min_overlap, max_overlap, max_span_chars)
+
+    if stats is not None:
+        naive = len(chunks) + len(reranked)
+        stats["chunks_in"] = naive
+        stats["duplicates"] = naive - len(merged)
+        stats["collapsed"] = len(merged) - len(collapsed)
+        stats["chunks_out"] = len(collapsed)
+        stats["tokens_saved"] = (
+            sum(count_tokens(c.page_content) for c in itertools.chain(chunks, reranked))
+            - sum(count_tokens(c.page_content) for c in collapsed)
+        )
+    return collapsed
 
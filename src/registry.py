@@ -0,0 +1,119 @@
+"""
+Model Registry - Process-wide, lazily created models and clients
+
+Embedding models, Chroma stores and Ollama clients are created on first
+use and shared by ingestion, retrieval and the Gradio app. Nothing heavy
+happens at import time; call warm_up() to pay the loading cost up front.
+"""
+
+import threading
+from pathlib import Path
+
+from src.utils.config import load_section, resolve_path
+
+DEFAULT_EMBEDDING_MODEL = "intfloat/e5-large-v2"
+
+_instances = {}
+_lock = threading.RLock()
+_ollama_overrides = {}
+
+
+def _get_or_create(key, factory):
+    with _lock:
+        if key not in _instances:
+            _instances[key] = factory()
+        return _instances[key]
+
+
+def ollama_settings():
+    """The `ollama` config section with defaults for a local server"""
+    settings = load_section("ollama", {
+        "host": "http://localhost:11434",
+        "openai_compatible_url": "http://localhost:11434/v1",
+        "model": "llama3.2",
+        "api_key": "ollama",
+    })
+    settings.update(_ollama_overrides)
+    return settings
+
+
+def override_ollama_settings(**settings):
+    """
+    Point the shared Ollama clients somewhere else (e.g. the benchmark's mock
+    server). Call with no arguments to go back to config.json.
+    """
+    with _lock:
+        _ollama_overrides.clear()
+        _ollama_overrides.update(settings)
+        for key in [k for k in _instances if k[0] in ("ollama_client", "ollama_llm", "reranker")]:
+            del _instances[key]
+
+
+def default_db_path() -> Path:
+    """Chroma directory from `data_paths.vector_db`"""
+    return resolve_path(load_section("data_paths", {"vector_db": "./vectors"})["vector_db"])
+
+
+def get_embeddings(model_name=DEFAULT_EMBEDDING_MODEL, normalize=True):
+    """Shared embedding model (loaded once per model/normalize pair)"""
+    from src.embedder import load_embeddings
+    return _get_or_create(("embeddings", model_name, normalize),
+                          lambda: load_embeddings(model_name, normalize))
+
+
+def get_vectorstore(db_path=None):
+    """Shared Chroma store for a persist directory"""
+    from langchain_chroma import Chroma
+    db_path = str(db_path or default_db_path())
+    return _get_or_create(("chroma", db_path),
+                          lambda: Chroma(persist_directory=db_path, embedding_function=get_embeddings()))
+
+
+def get_lexical_index(db_path=None):
+    """Shared BM25 index for a persist directory (reloaded after re-ingestion)"""
+    from src.embedder import read_index_version
+    from src.lexical_index import BM25Index
+    db_path = str(db_path or default_db_path())
+    version = read_index_version(db_path)
+    with _lock:
+        for key in [k for k in _instances if k[0] == "bm25" and k[1] == db_path and k[2] != version]:
+            del _instances[key]
+        return _get_or_create(("bm25", db_path, version), lambda: BM25Index.load(db_path))
+
+
+def get_ollama_client():
+    """Shared OpenAI-compatible client for the Ollama /v1 endpoint"""
+    from openai import OpenAI
+    settings = ollama_settings()
+    return _get_or_create(("ollama_client", settings["openai_compatible_url"]),
+                          lambda: OpenAI(base_url=settings["openai_compatible_url"], api_key=settings["api_key"]))
+
+
+def get_ollama_llm():
+    """Shared LangChain Ollama LLM (used for query rewriting)"""
+    from langchain_community.llms import Ollama
+    settings = ollama_settings()
+    return _get_or_create(("ollama_llm", settings["host"], settings["model"]),
+                          lambda: Ollama(model=settings["model"], base_url=settings["host"], temperature=0))
+
+
+def get_reranker():
+    """Shared reranker selected by `advanced_rag.chunk_reranking` (the LLM backend uses get_ollama_client())"""
+    from src.reranker import create_reranker
+    backend = load_section("advanced_rag", {"chunk_reranking": "cross_encoder"})["chunk_reranking"]
+    return _get_or_create(("reranker", backend, ollama_settings()["openai_compatible_url"]),
+                          lambda: create_reranker(backend, client=get_ollama_client(), **load_section("reranker")))
+
+
+def warm_up(db_path=None):
+    """Load the embedding model and open the vector store ahead of the first request"""
+    vectorstore = get_vectorstore(db_path)
+    vectorstore.embeddings.embed_query("warm up")
+    get_ollama_client()
+    get_ollama_llm()
+
+
+def reset():
+    """Drop every shared instance (they are recreated on next use)"""
+    with _lock:
+        _instances.clear()
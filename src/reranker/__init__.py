@@ -0,0 +1,21 @@
+"""
+Reranker Module - Reorder retrieved chunks by relevance
+"""
+
+from .reranker import (
+    RankOrder,
+    BaseReranker,
+    NoopReranker,
+    LLMReranker,
+    CrossEncoderReranker,
+    create_reranker,
+)
+
+__all__ = [
+    "RankOrder",
+    "BaseReranker",
+    "NoopReranker",
+    "LLMReranker",
+    "CrossEncoderReranker",
+    "create_reranker",
+]
@@ -0,0 +1,178 @@
+"""
+Rerankers - Reorder retrieved chunks by relevance to the question
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from src.utils.hashing import chunk_id, text_hash
+
+
+class RankOrder(BaseModel):
+   order: list[int] = Field(description="he order of relevance of chunks, from most relevant to least relevant, by chunk id number")
+
+
+class BaseReranker(ABC):
+    """Base class for rerankers"""
+
+    @abstractmethod
+    def rerank(self, question: str, chunks: List) -> List:
+        """Return the chunks ordered from most to least relevant"""
+        pass
+
+
+class NoopReranker(BaseReranker):
+    """Keeps the retrieval order (reranking disabled)"""
+
+    def rerank(self, question: str, chunks: List) -> List:
+        return list(chunks)
+
+
+class LLMReranker(BaseReranker):
+    """Asks an LLM for a structured RankOrder over all chunks in one prompt"""
+
+    SYSTEM_PROMPT = """
+You are a document re-ranker.
+You are provided with a question and a list of relevant chunks of text from a query of a knowledge base.
+The chunks are provided in the order they were retrieved; this should be approximately ordered by relevance, but you may be able to improve on that.
+You must rank order the provided chunks by relevance to the question, with the most relevant chunk first.
+Reply only with the list of ranked chunk ids, nothing else. Include all the chunk ids you are provided with, reranked.
+strictly reply do not leave the order empty and do not add or remove any chunk ids.
+"""
+
+    def __init__(self, client, model: str = "llama3.1"):
+        """
+        Initialize LLM reranker
+
+        Args:
+            client: OpenAI-compatible client (e.g. Ollama's /v1 endpoint)
+            model: Model name (default: llama3.1)
+        """
+        self.client = client
+        self.model = model
+
+    def rerank(self, question: str, chunks: List) -> List:
+        user_prompt = f"The user has asked the following question:\n\n{question}\n\nOrder all the chunks of text by relevance to the question, from most relevant to least relevant. Include all the chunk ids you are provided with, reranked.\n\n"
+        user_prompt += "Here are the chunks:\n\n"
+        for index, chunk in enumerate(chunks):
+            user_prompt += f"# CHUNK ID: {index + 1}:\n\n{chunk.page_content}\n\n"
+        user_prompt += "Reply only with the list of ranked chunk ids, nothing else."
+        messages = [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+        response = self.client.chat.completions.parse(
+            model=self.model,
+            messages=messages,
+            response_format=RankOrder,
+        )
+        parsed = response.choices[0].message.parsed
+        order = parsed.order
+        return [chunks[i - 1] for i in order if isinstance(i, int) and 1 <= i <= len(chunks)]
+
+
+class CrossEncoderReranker(BaseReranker):
+    """Scores (question, chunk) pairs with a local cross-encoder on CPU"""
+
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+                 batch_size: int = 32, max_length: int = 512, device: str = "cpu",
+                 cache_size: int = 4096):
+        """
+        Initialize cross-encoder reranker
+
+        Args:
+            model_name: HuggingFace cross-encoder model
+            batch_size: Maximum pairs per forward pass
+            max_length: Maximum tokens per (question, chunk) pair
+            device: Torch device (default: cpu)
+            cache_size: Number of (question hash, chunk id, chunk text hash) scores kept
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.device = device
+        self.cache_size = cache_size
+        self.model = None
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _initialize_model(self):
+        """Load the cross-encoder on first use"""
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers is required. Install with: pip install sentence-transformers"
+            )
+        self.model = CrossEncoder(self.model_name, max_length=self.max_length, device=self.device)
+
+    def score(self, question: str, chunks: List) -> List[float]:
+        """Relevance score per chunk; only uncached pairs go through the model"""
+        question_hash = text_hash(question)
+        # Chunk ids are positional and survive content changes, so the text is part of the key
+        keys = [(question_hash, chunk_id(chunk), text_hash(chunk.page_content)) for chunk in chunks]
+
+        with self._lock:
+            known = {key: self._scores[key] for key in keys if key in self._scores}
+        missing = {}
+        for key, chunk in zip(keys, chunks):
+            if key not in known and key not in missing:
+                missing[key] = chunk.page_content
+        if missing:
+            if self.model is None:
+                self._initialize_model()
+            pairs = [(question, text) for text in missing.values()]
+            scores = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            known.update((key, float(score)) for key, score in zip(missing, scores))
+
+        with self._lock:
+            for key in keys:
+                self._scores[key] = known[key]
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+        return [known[key] for key in keys]
+
+    def rerank(self, question: str, chunks: List) -> List:
+        scores = self.score(question, chunks)
+        order = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+        # Copies, so the caller's (possibly shared or cached) documents are not modified
+        return [
+            chunks[i].model_copy(update={"metadata": {**chunks[i].metadata, "rerank_score": scores[i]}})
+            for i in order
+        ]
+
+
+def create_reranker(backend, client=None, **settings) -> BaseReranker:
+    """
+    Create a reranker from the `advanced_rag.chunk_reranking` setting
+
+    Args:
+        backend: "cross_encoder", "llm" (or true), "none" (or false)
+        client: OpenAI-compatible client, required by the LLM backend
+        **settings: Backend options from the `reranker` config section
+
+    Returns:
+        Reranker instance
+    """
+    if backend is True:
+        backend = "llm"
+    if backend in (False, None, "none"):
+        return NoopReranker()
+    if backend == "llm":
+        if client is None:
+            raise ValueError("The llm reranker needs an OpenAI-compatible client")
+        return LLMReranker(client, model=settings.get("llm_model", "llama3.1"))
+    if backend == "cross_encoder":
+        return CrossEncoderReranker(
+            model_name=settings.get("cross_encoder_model", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+            batch_size=settings.get("batch_size", 32),
+            max_length=settings.get("max_length", 512),
+            device=settings.get("device", "cpu"),
+            cache_size=settings.get("cache_size", 4096),
+        )
+    raise ValueError(f"Unknown reranker backend: {backend}")
@@ -1,13 +1,11 @@
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from src.registry import get_vectorstore
 
 
-def get_retriever(db_path, top_k=10):
-    embeddings = HuggingFaceEmbeddings(
-            model_name="intfloat/e5-large-v2",
-            encode_kwargs={"normalize_embeddings": True},  # recommended for cosine similarity
-        )
-    vectorstore = Chroma(persist_directory=db_path, embedding_function=embeddings)
-    retriever = vectorstore.as_retriever(search_kwargs={"k": top_k})
+def get_retriever(db_path, top_k=10, filter=None):
+    """Chroma retriever; `filter` is a Chroma `where` clause on chunk metadata (e.g. {"type": "resume"})."""
+    vectorstore = get_vectorstore(db_path)
+    search_kwargs = {"k": top_k}
+    if filter:
+        search_kwargs["filter"] = filter
+    retriever = vectorstore.as_retriever(search_kwargs=search_kwargs)
     return retriever
-
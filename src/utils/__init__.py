@@ -3,9 +3,21 @@ Utilities Module - Helper functions
 """
 
 from .logger import get_logger
-from .config import load_config
+from .config import load_config, load_section, resolve_path
+from .hashing import text_hash, chunk_id
+from .filters import matches_filter
+from .timing import stage_timer, summarize_timings
+from .tokens import count_tokens
 
 __all__ = [
     "get_logger",
     "load_config",
+    "load_section",
+    "resolve_path",
+    "text_hash",
+    "chunk_id",
+    "matches_filter",
+    "stage_timer",
+    "summarize_timings",
+    "count_tokens",
 ]
@@ -7,6 +7,9 @@ import os
 from typing import Dict, Any
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / "config" / "config.json"
+
 
 def load_config(config_file: str) -> Dict[str, Any]:
     """
@@ -39,3 +42,33 @@ def load_env_config() -> Dict[str, Any]:
         'embedding_model': os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2'),
         'llm_model': os.getenv('LLM_MODEL', 'gpt-3.5-turbo'),
     }
+
+
+def load_section(section: str, defaults: Dict[str, Any] = None,
+                 config_file: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load one section of the project config, filled in with defaults
+
+    Missing config files or sections fall back to the defaults so that
+    modules can be imported without a config on disk.
+
+    Args:
+        section: Top-level key in config.json (e.g. "answer_cache")
+        defaults: Values used for keys missing from the section
+        config_file: Path to config file (default: config/config.json)
+
+    Returns:
+        Merged section dictionary
+    """
+    merged = dict(defaults or {})
+    try:
+        merged.update(load_config(config_file).get(section) or {})
+    except FileNotFoundError:
+        pass
+    return merged
+
+
+def resolve_path(path: str) -> Path:
+    """Resolve a config path (e.g. "./vectors") against the project root"""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
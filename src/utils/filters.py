@@ -0,0 +1,35 @@
+"""
+Metadata filters in Chroma `where` syntax, for stores other than Chroma
+
+Supported: {"field": value}, {"field": {"$eq": value}}, {"field": {"$in": [...]}},
+{"$and": [...]} and {"$or": [...]}.
+"""
+
+from typing import Dict, Optional, Set
+
+
+def matches_filter(metadata: Dict, where: Optional[Dict]) -> bool:
+    """True if `metadata` satisfies the `where` filter (None matches everything)"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif metadata.get(key) not in allowed_values(condition):
+            return False
+    return True
+
+
+def allowed_values(condition) -> Set:
+    """Values accepted by one field condition (plain value, $eq or $in)"""
+    if isinstance(condition, dict):
+        if "$in" in condition:
+            return set(condition["$in"])
+        if "$eq" in condition:
+            return {condition["$eq"]}
+        raise ValueError(f"Unsupported filter operator: {condition}")
+    return {condition}
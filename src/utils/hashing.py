@@ -0,0 +1,23 @@
+"""
+Hashing utilities
+"""
+
+import hashlib
+
+
+def text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a string"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(chunk) -> str:
+    """
+    Stable identifier for a LangChain Document chunk
+
+    Uses the vector store id when the chunk has one, otherwise a hash of
+    its source and content.
+    """
+    doc_id = getattr(chunk, "id", None) or chunk.metadata.get("id")
+    if doc_id:
+        return str(doc_id)
+    return text_hash(f"{chunk.metadata.get('source', '')}\n{chunk.page_content}")
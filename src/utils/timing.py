@@ -0,0 +1,69 @@
+"""
+Timing utilities
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], stage: str):
+    """
+    Record the wall-clock duration of a block under ``timings[stage]``
+
+    Args:
+        timings: Dictionary the duration (in seconds) is written to
+        stage: Stage name used as the dictionary key
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation between closest ranks
+
+    Args:
+        values: Sample values
+        pct: Percentile in the range [0, 100]
+
+    Returns:
+        Percentile value (0.0 for an empty sample)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_timings(samples: List[Dict[str, float]],
+                      percentiles: Iterable[float] = (50, 95)) -> Dict[str, Dict[str, float]]:
+    """
+    Summarize per-stage timings collected over many runs
+
+    Args:
+        samples: One timings dictionary per run
+        percentiles: Percentiles to report for each stage
+
+    Returns:
+        Mapping of stage -> {"p50": ..., "p95": ..., "mean": ..., "count": ...}
+    """
+    by_stage: Dict[str, List[float]] = {}
+    for sample in samples:
+        for stage, seconds in sample.items():
+            by_stage.setdefault(stage, []).append(seconds)
+
+    summary = {}
+    for stage, values in by_stage.items():
+        stats = {f"p{int(p) if float(p).is_integer() else p}": percentile(values, p) for p in percentiles}
+        stats["mean"] = sum(values) / len(values)
+        stats["count"] = len(values)
+        summary[stage] = stats
+    return summary
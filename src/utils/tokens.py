@@ -0,0 +1,33 @@
+"""
+Token counting for prompt budgets
+
+Uses tiktoken (installed with langchain-openai) when available; otherwise
+falls back to the usual ~4 characters per token estimate.
+"""
+
+from functools import lru_cache
+
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _encoding(name):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # Encoding files are downloaded on first use; offline machines fall back.
+        return None
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Number of tokens in `text` (approximate when tiktoken is unavailable)"""
+    if not text:
+        return 0
+    enc = _encoding(encoding)
+    if enc is None:
+        return max(1, len(text) // 4)
+    return len(enc.encode(text, disallowed_special=()))
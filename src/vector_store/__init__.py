@@ -2,9 +2,15 @@
 Vector Store Module - Store and retrieve embeddings
 """
 
-from .store import VectorStore, InMemoryVectorStore
+from .store import VectorStore, InMemoryVectorStore, BaseVectorStore, SearchResult
+from .ivf import IVFVectorStore
+from .quantized import QuantizedVectorStore
 
 __all__ = [
     "VectorStore",
     "InMemoryVectorStore",
+    "IVFVectorStore",
+    "QuantizedVectorStore",
+    "BaseVectorStore",
+    "SearchResult",
 ]
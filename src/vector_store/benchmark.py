@@ -0,0 +1,138 @@
+"""
+Vector Store Benchmark - Compare approximate and quantized search against exact search
+
+Usage:
+    python -m src.vector_store.benchmark --size 100000 --dim 1024 --nprobe 1 4 8 16
+    python -m src.vector_store.benchmark --mode quantization --size 100000
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from .ivf import IVFVectorStore
+from .quantized import QuantizedVectorStore
+from .store import BaseVectorStore, InMemoryVectorStore
+
+
+def synthetic_embeddings(size: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Clustered random vectors, closer to real embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=size)
+    return centers[labels] + 0.5 * rng.normal(size=(size, dim)).astype(np.float32)
+
+
+def recall_at_k(exact: List[List[int]], approx: List[List[int]], k: int) -> float:
+    """Fraction of the exact top-k ids that the approximate search also returned"""
+    hits = sum(len(set(e[:k]) & set(a[:k])) for e, a in zip(exact, approx))
+    return hits / max(1, sum(len(e[:k]) for e in exact))
+
+
+def timed_search(store: BaseVectorStore, queries: np.ndarray, k: int, **kwargs) -> Dict:
+    """Run one query at a time and return ids and queries per second"""
+    start = time.perf_counter()
+    ids = [[r.id for r in store.search(q, k, **kwargs)] for q in queries]
+    elapsed = time.perf_counter() - start
+    return {"ids": ids, "qps": len(queries) / elapsed if elapsed else float("inf")}
+
+
+def compare_ann(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                nprobes: List[int] = (1, 4, 8, 16), n_lists: int = None) -> Dict:
+    """
+    Build exact and IVF stores over the same vectors and report recall@k / QPS
+
+    Returns:
+        {"exact": {"qps": ...}, "ivf": [{"nprobe": ..., "recall@k": ..., "qps": ...}, ...]}
+    """
+    texts = [""] * len(vectors)
+    exact_store = InMemoryVectorStore()
+    exact_store.add_vectors(texts, vectors)
+    ivf_store = IVFVectorStore(n_lists=n_lists, min_train_size=1)
+    start = time.perf_counter()
+    ivf_store.add_vectors(texts, vectors)
+    build_seconds = time.perf_counter() - start
+
+    exact = timed_search(exact_store, queries, k)
+    report = {
+        "size": len(vectors),
+        "dim": vectors.shape[1],
+        "k": k,
+        "exact": {"qps": exact["qps"]},
+        "ivf": [],
+        "ivf_build_seconds": build_seconds,
+        "ivf_lists": len(ivf_store.centroids),
+    }
+    for nprobe in nprobes:
+        approx = timed_search(ivf_store, queries, k, nprobe=nprobe)
+        report["ivf"].append({
+            "nprobe": nprobe,
+            f"recall@{k}": recall_at_k(exact["ids"], approx["ids"], k),
+            "qps": approx["qps"],
+        })
+    return report
+
+
+def compare_quantization(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                         rescore_factors: List[int] = (0, 4)) -> Dict:
+    """
+    Report memory saved and recall@k lost by int8 / float16 storage
+
+    Returns:
+        {"float32_bytes": ..., "exact": {"qps": ...},
+         "quantized": [{"quantization": ..., "rescore_factor": ..., "bytes": ...,
+                        "memory_ratio": ..., "recall@k": ..., "qps": ...}, ...]}
+    """
+    texts = [""] * len(vectors)
+    exact_store = InMemoryVectorStore()
+    exact_store.add_vectors(texts, vectors)
+    exact = timed_search(exact_store, queries, k)
+    float32_bytes = exact_store.vectors.nbytes
+    report = {
+        "size": len(vectors),
+        "dim": vectors.shape[1],
+        "k": k,
+        "float32_bytes": float32_bytes,
+        "exact": {"qps": exact["qps"]},
+        "quantized": [],
+    }
+    for quantization in QuantizedVectorStore.MODES:
+        store = QuantizedVectorStore(quantization, base=exact_store)
+        for factor in rescore_factors:
+            approx = timed_search(store, queries, k, rescore_factor=factor)
+            report["quantized"].append({
+                "quantization": quantization,
+                "rescore_factor": factor,
+                "bytes": store.nbytes,
+                "memory_ratio": store.nbytes / float32_bytes,
+                f"recall@{k}": recall_at_k(exact["ids"], approx["ids"], k),
+                "qps": approx["qps"],
+            })
+    return report
+
+
+def main():
+    """Command-line interface for the vector store benchmarks."""
+    parser = argparse.ArgumentParser(description="Compare IVF / quantized search with exact search")
+    parser.add_argument("--mode", choices=["ann", "quantization"], default="ann", help="What to benchmark")
+    parser.add_argument("--size", type=int, default=100000, help="Number of stored vectors")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension (e5-large-v2: 1024)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16], help="nprobe values to try")
+    parser.add_argument("--lists", type=int, default=None, help="Number of IVF lists")
+    args = parser.parse_args()
+
+    data = synthetic_embeddings(args.size + args.queries, args.dim)
+    if args.mode == "quantization":
+        report = compare_quantization(data[:args.size], data[args.size:], args.k)
+    else:
+        report = compare_ann(data[:args.size], data[args.size:], args.k, args.nprobe, args.lists)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+IVF Vector Store - Approximate nearest-neighbour search with an inverted file index
+"""
+
+from typing import List, Dict
+import numpy as np
+
+from .store import BaseVectorStore, InMemoryVectorStore, SearchResult, normalize_rows, top_k_indices
+
+
+class IVFVectorStore(BaseVectorStore):
+    """
+    Inverted-file (IVF) approximate vector store in pure NumPy
+
+    Vectors are clustered with spherical k-means; a query only scores the
+    rows in its `nprobe` closest clusters. More probes means higher recall
+    and slower queries. Until `min_train_size` vectors have been added the
+    store answers with exact search. New vectors are assigned to the nearest
+    existing centroid, and the clustering is retrained once the store has
+    grown `retrain_factor` times since the last training.
+    """
+
+    def __init__(self, n_lists: int = None, nprobe: int = 8, min_train_size: int = 1024,
+                 kmeans_iters: int = 10, retrain_factor: float = 4.0, seed: int = 0):
+        """
+        Initialize IVF store
+
+        Args:
+            n_lists: Number of clusters (default: ~4 * sqrt(n) at training time)
+            nprobe: Clusters scanned per query (recall/latency knob)
+            min_train_size: Vectors needed before the index is trained
+            kmeans_iters: k-means iterations per training
+            retrain_factor: Retrain when the store grows this many times
+            seed: Random seed for centroid initialization
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.kmeans_iters = kmeans_iters
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self.base = InMemoryVectorStore()
+        self.centroids = None
+        self._lists = []
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None) -> List[int]:
+        """Add vectors; they are searchable through the index immediately"""
+        ids = self.base.add_vectors(texts, embeddings, metadata)
+        if not ids:
+            return ids
+        if not self.is_trained:
+            if len(self.base) >= self.min_train_size:
+                self.train()
+        elif len(self.base) >= self._trained_size * self.retrain_factor:
+            self.train()
+        else:
+            self._assign(np.asarray(ids))
+        return ids
+
+    def train(self):
+        """(Re)cluster all stored vectors and rebuild the inverted lists"""
+        vectors = self.base.vectors
+        n = len(vectors)
+        if n == 0:
+            return
+        n_lists = min(self.n_lists or max(1, int(4 * np.sqrt(n))), n)
+        rng = np.random.default_rng(self.seed)
+        sample = vectors[rng.choice(n, size=min(n, 256 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iters):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+
+        self.centroids = centroids
+        self._lists = [np.empty(0, dtype=np.int64) for _ in range(n_lists)]
+        self._trained_size = n
+        self._assign(np.arange(n))
+
+    def _assign(self, ids: np.ndarray):
+        assignment = np.argmax(self.base.vectors[ids] @ self.centroids.T, axis=1)
+        for cluster in np.unique(assignment):
+            self._lists[cluster] = np.concatenate([self._lists[cluster], ids[assignment == cluster]])
+
+    def search(self, query_embedding: np.ndarray, k: int = 5, nprobe: int = None,
+               filter: Dict = None) -> List[SearchResult]:
+        """
+        Approximate cosine search over the `nprobe` closest clusters
+
+        With a metadata filter, probed rows outside the filter are dropped;
+        if fewer than k remain, the filtered rows are searched exactly.
+        """
+        if not self.is_trained:
+            return self.base.search(query_embedding, k, filter=filter)
+        query = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+        probes = top_k_indices(self.centroids @ query, nprobe or self.nprobe)
+        candidates = np.concatenate([self._lists[c] for c in probes])
+        rows = self.base.filter_rows(filter)
+        if rows is not None:
+            candidates = candidates[np.isin(candidates, rows)]
+            if len(candidates) < k:
+                return self.base.search(query_embedding, k, filter=filter)
+        if len(candidates) == 0:
+            return []
+        scores = self.base.vectors[candidates] @ query
+        best = top_k_indices(scores, k)
+        return [
+            SearchResult(self.base.texts[i], float(s), self.base.metadata[i], int(i))
+            for i, s in zip(candidates[best], scores[best])
+        ]
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5, nprobe: int = None,
+                     filter: Dict = None) -> List[List[SearchResult]]:
+        """Search many query vectors"""
+        return [self.search(q, k, nprobe, filter=filter) for q in np.atleast_2d(query_embeddings)]
@@ -0,0 +1,122 @@
+"""
+Quantized Vector Store - int8 / float16 first-pass search with exact rescoring
+"""
+
+from typing import List, Dict
+import numpy as np
+
+from .store import BaseVectorStore, InMemoryVectorStore, SearchResult, normalize_rows, top_k_indices
+
+
+class QuantizedVectorStore(BaseVectorStore):
+    """
+    Vector store that searches a compressed copy of the vectors
+
+    The first pass scores every row of an int8 (per-dimension scale) or
+    float16 matrix; the best `k * rescore_factor` candidates are then
+    rescored exactly against the float32 vectors of the underlying
+    InMemoryVectorStore. Loading that store with mmap=True keeps the
+    float32 block on disk, so only the quantized matrix stays resident.
+    """
+
+    MODES = ("int8", "float16")
+
+    def __init__(self, quantization: str = "int8", rescore_factor: int = 4,
+                 base: InMemoryVectorStore = None, block_rows: int = 65536):
+        """
+        Initialize quantized store
+
+        Args:
+            quantization: "int8" or "float16"
+            rescore_factor: Candidates rescored per requested result (0 = no rescoring)
+            base: Existing float32 store to index (default: a new empty one)
+            block_rows: Rows dequantized at a time during the first pass
+        """
+        if quantization not in self.MODES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.block_rows = block_rows
+        self.base = base or InMemoryVectorStore()
+        self.codes = None
+        self.scales = None
+        if len(self.base):
+            self._quantize_all()
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def nbytes(self) -> int:
+        """Resident size of the quantized matrix (and scales)"""
+        if self.codes is None:
+            return 0
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def _encode(self, rows: np.ndarray) -> np.ndarray:
+        if self.quantization == "float16":
+            return rows.astype(np.float16)
+        return np.clip(np.rint(rows / self.scales), -127, 127).astype(np.int8)
+
+    def _quantize_all(self):
+        vectors = self.base.vectors
+        if self.quantization == "int8":
+            self.scales = (np.abs(vectors).max(axis=0) / 127.0 + 1e-12).astype(np.float32)
+        self.codes = self._encode(vectors)
+
+    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None) -> List[int]:
+        """Add vectors; int8 scales are widened (and all rows re-encoded) if needed"""
+        ids = self.base.add_vectors(texts, embeddings, metadata)
+        if not ids:
+            return ids
+        rows = self.base.vectors[ids[0]:]
+        if self.codes is None:
+            self._quantize_all()
+        elif self.quantization == "int8" and np.any(np.abs(rows).max(axis=0) > self.scales * 127.0):
+            self._quantize_all()
+        else:
+            self.codes = np.concatenate([self.codes, self._encode(rows)])
+        return ids
+
+    def _first_pass(self, query: np.ndarray, rows: np.ndarray = None) -> np.ndarray:
+        """Approximate scores for every row (or only `rows`), dequantizing block by block"""
+        weights = query * self.scales if self.quantization == "int8" else query
+        total = len(self.codes) if rows is None else len(rows)
+        scores = np.empty(total, dtype=np.float32)
+        for start in range(0, total, self.block_rows):
+            if rows is None:
+                block = self.codes[start:start + self.block_rows]
+            else:
+                block = self.codes[rows[start:start + self.block_rows]]
+            scores[start:start + len(block)] = block.astype(np.float32) @ weights
+        return scores
+
+    def search(self, query_embedding: np.ndarray, k: int = 5, rescore_factor: int = None,
+               filter: Dict = None) -> List[SearchResult]:
+        """Quantized first pass (within an optional metadata filter), then exact float32 rescoring"""
+        if not len(self.base):
+            return []
+        query = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+        rows = self.base.filter_rows(filter)
+        if rows is not None and not len(rows):
+            return []
+        approx = self._first_pass(query, rows)
+        factor = self.rescore_factor if rescore_factor is None else rescore_factor
+        if factor:
+            # Sorted row order keeps reads from a memory-mapped base sequential
+            positions = np.sort(top_k_indices(approx, k * factor))
+            candidates = positions if rows is None else rows[positions]
+            scores = self.base.vectors[candidates] @ query
+        else:
+            candidates = np.arange(len(approx)) if rows is None else rows
+            scores = approx
+        best = top_k_indices(scores, k)
+        return [
+            SearchResult(self.base.texts[i], float(s), self.base.metadata[i], int(i))
+            for i, s in zip(candidates[best], scores[best])
+        ]
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5,
+                     filter: Dict = None) -> List[List[SearchResult]]:
+        """Search many query vectors"""
+        return [self.search(q, k, filter=filter) for q in np.atleast_2d(query_embeddings)]
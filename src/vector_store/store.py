@@ -2,95 +2,279 @@
 Vector Store - Store and manage vector embeddings
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, NamedTuple
 from abc import ABC, abstractmethod
+import inspect
 import numpy as np
 import json
+import os
 from pathlib import Path
 
+from src.utils.filters import allowed_values, matches_filter
+
+
+class SearchResult(NamedTuple):
+    """A single search hit"""
+    text: str
+    score: float
+    metadata: Dict
+    id: int
+
 
 class BaseVectorStore(ABC):
     """Base class for vector stores"""
-    
+
     @abstractmethod
-    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None):
-        """Add vectors to store"""
+    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None) -> List[int]:
+        """Add vectors to store and return their row ids"""
         pass
-    
+
     @abstractmethod
-    def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+    def search(self, query_embedding: np.ndarray, k: int = 5) -> List[SearchResult]:
         """Search for similar vectors"""
         pass
 
 
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a 2D float32 matrix"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / (norms + 1e-10)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores along the last axis, best first
+
+    Uses argpartition so only the k candidates are sorted.
+    """
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
 class InMemoryVectorStore(BaseVectorStore):
-    """Simple in-memory vector store"""
-    
-    def __init__(self):
-        self.vectors = []
+    """
+    In-memory vector store backed by one contiguous float32 matrix
+
+    Rows are L2-normalized on insert, so cosine similarity is a plain
+    matrix-vector product. Capacity grows by doubling. Row ids are the
+    insertion positions and never change. Rows are also indexed by their
+    `type` metadata, so a filtered search only scores the matching rows.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    META_FILE = "meta.json"
+    INDEXED_FIELD = "type"
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.initial_capacity = initial_capacity
+        self._matrix = None
+        self._size = 0
         self.texts = []
         self.metadata = []
-    
-    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None):
-        """Add vectors to store"""
-        for i, (text, embedding) in enumerate(zip(texts, embeddings)):
-            self.vectors.append(embedding)
-            self.texts.append(text)
-            self.metadata.append(metadata[i] if metadata else {})
-    
-    def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
-        """Search for similar vectors using cosine similarity"""
-        if not self.vectors:
+        self._field_rows = {}
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized vectors currently stored, one row per entry"""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, needed: int, dim: int):
+        """Grow the matrix (by doubling) to hold `needed` rows"""
+        if self._matrix is not None and needed <= self._matrix.shape[0]:
+            return
+        capacity = max(self.initial_capacity, self._matrix.shape[0] if self._matrix is not None else 0)
+        while capacity < needed:
+            capacity *= 2
+        matrix = np.empty((capacity, dim), dtype=np.float32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def add_vectors(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None) -> List[int]:
+        """Add vectors to store and return their row ids"""
+        if len(texts) == 0:
             return []
-        
-        # Normalize embeddings
-        query_norm = query_embedding / (np.linalg.norm(query_embedding) + 1e-10)
-        
-        similarities = []
-        for i, vec in enumerate(self.vectors):
-            vec_norm = vec / (np.linalg.norm(vec) + 1e-10)
-            similarity = np.dot(query_norm, vec_norm)
-            similarities.append((self.texts[i], similarity, self.metadata[i]))
-        
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        return [(text, score) for text, score, _ in similarities[:k]]
-    
-    def save(self, filepath: str):
-        """Save vector store to disk"""
+        rows = normalize_rows(np.vstack(embeddings))
+        if self._matrix is not None and rows.shape[1] != self._matrix.shape[1]:
+            raise ValueError(f"Expected {self._matrix.shape[1]}-dim vectors, got {rows.shape[1]}")
+        start = self._size
+        self._reserve(start + len(rows), rows.shape[1])
+        self._matrix[start:start + len(rows)] = rows
+        self._size += len(rows)
+        self.texts.extend(texts)
+        self.metadata.extend(metadata[i] if metadata else {} for i in range(len(texts)))
+        self._index_rows(start)
+        return list(range(start, self._size))
+
+    def _index_rows(self, start: int = 0):
+        """Add rows from `start` onwards to the per-type row index"""
+        if start == 0:
+            self._field_rows = {}
+        for i in range(start, self._size):
+            self._field_rows.setdefault(self.metadata[i].get(self.INDEXED_FIELD), []).append(i)
+
+    def filter_rows(self, where: Dict = None) -> np.ndarray:
+        """
+        Row ids matching a Chroma-style `where` filter (None = all rows)
+
+        Filters on the indexed `type` field are answered from the row index;
+        anything else falls back to a scan of the metadata.
+        """
+        if not where:
+            return None
+        if set(where) == {self.INDEXED_FIELD}:
+            rows = [i for value in allowed_values(where[self.INDEXED_FIELD]) for i in self._field_rows.get(value, [])]
+            return np.sort(np.asarray(rows, dtype=np.int64))
+        return np.asarray([i for i, meta in enumerate(self.metadata) if matches_filter(meta, where)],
+                          dtype=np.int64)
+
+    def _results(self, indices: np.ndarray, scores: np.ndarray, rows: np.ndarray = None) -> List[SearchResult]:
+        ids = indices if rows is None else rows[indices]
+        return [
+            SearchResult(self.texts[i], float(scores[j]), self.metadata[i], int(i))
+            for i, j in zip(ids, indices)
+        ]
+
+    def search(self, query_embedding: np.ndarray, k: int = 5, filter: Dict = None) -> List[SearchResult]:
+        """Search for similar vectors using cosine similarity, optionally within a metadata filter"""
+        if self._size == 0:
+            return []
+        query = normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
+        rows = self.filter_rows(filter)
+        if rows is None:
+            scores = self.vectors @ query
+        elif len(rows):
+            scores = self.vectors[rows] @ query
+        else:
+            return []
+        return self._results(top_k_indices(scores, k), scores, rows)
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5, filter: Dict = None) -> List[List[SearchResult]]:
+        """Search many queries with a single matrix-matrix product"""
+        queries = normalize_rows(np.atleast_2d(query_embeddings))
+        rows = self.filter_rows(filter)
+        if self._size == 0 or (rows is not None and not len(rows)):
+            return [[] for _ in range(len(queries))]
+        scores = queries @ (self.vectors if rows is None else self.vectors[rows]).T
+        indices = top_k_indices(scores, k)
+        return [self._results(indices[q], scores[q], rows) for q in range(len(queries))]
+
+    def save(self, path: str):
+        """
+        Save vector store to disk
+
+        Writes a directory holding a float32 ``vectors.npy`` block and a
+        ``meta.json`` sidecar with texts and metadata. A path ending in
+        ``.json`` writes the legacy single-file JSON format instead.
+        """
+        path = Path(path)
+        if path.suffix == '.json':
+            self._save_json(path)
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        # Written to temp files and swapped in, never truncated in place: the
+        # current vectors (or another process) may be memory-mapping them
+        vectors_tmp = path / (self.VECTORS_FILE + '.tmp')
+        meta_tmp = path / (self.META_FILE + '.tmp')
+        with open(vectors_tmp, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'texts': self.texts, 'metadata': self.metadata}, f, separators=(',', ':'))
+        os.replace(vectors_tmp, path / self.VECTORS_FILE)
+        os.replace(meta_tmp, path / self.META_FILE)
+
+    def load(self, path: str, mmap: bool = True):
+        """
+        Load vector store from disk
+
+        The binary format is memory-mapped read-only by default, so loading
+        is near-instant and processes opening the same store share the page
+        cache. The first add_vectors call copies the rows into memory.
+        Legacy ``.json`` files are still readable.
+        """
+        path = Path(path)
+        if path.suffix == '.json':
+            self._load_json(path)
+            return
+        with open(path / self.META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        matrix = np.load(path / self.VECTORS_FILE, mmap_mode='r' if mmap else None)
+        self._matrix = matrix if len(matrix) else None
+        self._size = len(matrix)
+        self.texts = meta['texts']
+        self.metadata = meta['metadata']
+        self._index_rows()
+
+    def _save_json(self, filepath: Path):
         data = {
-            'vectors': [v.tolist() for v in self.vectors],
+            'vectors': self.vectors.tolist(),
             'texts': self.texts,
             'metadata': self.metadata
         }
         with open(filepath, 'w') as f:
             json.dump(data, f)
-    
-    def load(self, filepath: str):
-        """Load vector store from disk"""
+
+    def _load_json(self, filepath: Path):
         with open(filepath, 'r') as f:
             data = json.load(f)
-        self.vectors = [np.array(v) for v in data['vectors']]
-        self.texts = data['texts']
-        self.metadata = data['metadata']
+        self._matrix = None
+        self._size = 0
+        self.texts = []
+        self.metadata = []
+        self._field_rows = {}
+        if data['vectors']:
+            self.add_vectors(data['texts'], np.asarray(data['vectors'], dtype=np.float32), data['metadata'])
 
 
 class VectorStore:
     """Main vector store interface"""
-    
+
     def __init__(self, store: BaseVectorStore = None):
         """Initialize with vector store"""
         self.store = store or InMemoryVectorStore()
-    
-    def add(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None):
+
+    def add(self, texts: List[str], embeddings: List[np.ndarray], metadata: List[Dict] = None) -> List[int]:
         """Add vectors"""
-        self.store.add_vectors(texts, embeddings, metadata)
-    
-    def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
-        """Search vectors"""
+        return self.store.add_vectors(texts, embeddings, metadata)
+
+    def _check_filter_support(self, method: str):
+        if "filter" not in inspect.signature(getattr(self.store, method)).parameters:
+            raise ValueError(f"{type(self.store).__name__}.{method} does not support metadata filters")
+
+    def search(self, query_embedding: np.ndarray, k: int = 5, filter: Dict = None) -> List[SearchResult]:
+        """Search vectors (metadata filters need a store that supports them)"""
+        if filter:
+            self._check_filter_support("search")
+            return self.store.search(query_embedding, k, filter=filter)
         return self.store.search(query_embedding, k)
-    
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5, filter: Dict = None) -> List[List[SearchResult]]:
+        """Search many query vectors at once"""
+        if filter:
+            if not hasattr(self.store, "search_batch"):
+                self._check_filter_support("search")
+                return [self.store.search(q, k, filter=filter) for q in np.atleast_2d(query_embeddings)]
+            self._check_filter_support("search_batch")
+            return self.store.search_batch(query_embeddings, k, filter=filter)
+        if hasattr(self.store, "search_batch"):
+            return self.store.search_batch(query_embeddings, k)
+        return [self.store.search(q, k) for q in np.atleast_2d(query_embeddings)]
+
     def set_store(self, store: BaseVectorStore):
         """Change vector store"""
         self.store = store